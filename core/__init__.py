@@ -1,14 +1,30 @@
 # -*- coding: utf-8 -*-
-from .config import Config
-from .moj_xml_parser import MojXmlParser
-from .moj_xml_loader import MojXmlLoader
-from .kokudo_api_client import KokudoApiClient
-from .chiseki_progress import ChisekiProgressManager
-from .parcel_searcher import ParcelSearcher
-from .geocoder import Geocoder
-from .land_price_api import LandPriceApiClient
-
-__all__ = [
-    'Config', 'MojXmlParser', 'MojXmlLoader', 'KokudoApiClient',
-    'ChisekiProgressManager', 'ParcelSearcher', 'Geocoder', 'LandPriceApiClient',
-]
+"""Core modules.
+
+Submodules are imported on first attribute access so that importing any
+one of them (e.g. ``core.config``) does not load the others at startup.
+"""
+
+import importlib
+
+_EXPORTS = {
+    'Config': '.config',
+    'MojXmlParser': '.moj_xml_parser',
+    'MojXmlLoader': '.moj_xml_loader',
+    'KokudoApiClient': '.kokudo_api_client',
+    'ChisekiProgressManager': '.chiseki_progress',
+    'ParcelSearcher': '.parcel_searcher',
+    'Geocoder': '.geocoder',
+    'LandPriceApiClient': '.land_price_api',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
@@ -3,10 +3,10 @@
 
 import csv
 import os
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 
 from qgis.core import (
-    QgsVectorLayer, QgsField, QgsFeature, QgsProject,
+    QgsVectorLayer, QgsField, QgsFeature, QgsFeatureRequest, QgsProject,
     QgsMessageLog, Qgis, QgsWkbTypes, QgsGraduatedSymbolRenderer,
     QgsRendererRange, QgsFillSymbol, QgsSimpleFillSymbolLayer,
     QgsCategorizedSymbolRenderer, QgsRendererCategory,
@@ -218,16 +218,33 @@ class ChisekiProgressManager:
                             records: List[Dict],
                             join_field: str = 'N03_007') -> set:
         """行政区域レイヤのフィーチャと進捗データが一致する市区町村コードを返す."""
+        matching = set(self.find_matching_features(
+            admin_layer, records, join_field))
+        self._log(f'一致コード数: {len(matching)}')
+        return matching
+
+    def find_matching_features(self, admin_layer: QgsVectorLayer,
+                               records: List[Dict],
+                               join_field: str = 'N03_007') -> Dict[str, List[int]]:
+        """一致した市区町村コード -> フィーチャID一覧.
+
+        照合に使う属性だけを読み、ジオメトリは読まない。
+        """
         code_lookup, prefix_lookup, name_lookup = self._build_lookups(records)
-        matching = set()
-        for feat in admin_layer.getFeatures():
+        request = QgsFeatureRequest()
+        request.setFlags(QgsFeatureRequest.NoGeometry)
+        fields = admin_layer.fields()
+        request.setSubsetOfAttributes(
+            [n for n in (join_field, 'N03_003', 'N03_004')
+             if fields.indexOf(n) >= 0], fields)
+        matching: Dict[str, List[int]] = {}
+        for feat in admin_layer.getFeatures(request):
             rec = self._match_feature(feat, code_lookup, prefix_lookup,
                                       name_lookup, join_field)
             if rec is not None:
                 code = str(feat.attribute(join_field) or '')
                 if code:
-                    matching.add(code)
-        self._log(f'一致コード数: {len(matching)}')
+                    matching.setdefault(code, []).append(feat.id())
         return matching
 
     def apply_direct_style(self, admin_layer: QgsVectorLayer,
@@ -342,15 +359,34 @@ class ChisekiProgressManager:
     # Export
     # ------------------------------------------------------------------
 
-    @staticmethod
-    def export_csv(records: List[Dict], output_path: str):
+    EXPORT_CHUNK_ROWS = 5000
+
+    @classmethod
+    def export_csv(cls, records: List[Dict], output_path: str,
+                   progress_callback: Optional[Callable[[int], None]] = None,
+                   stop_check: Optional[Callable[[], bool]] = None):
+        """records を CSV に書き出す.
+
+        EXPORT_CHUNK_ROWS 行ごとに progress_callback(書込済み行数) を呼ぶ。
+        stop_check が True を返すと途中のファイルを削除し InterruptedError。
+        """
         if not records:
             return
         fieldnames = list(records[0].keys())
-        with open(output_path, 'w', encoding='utf-8-sig', newline='') as f:
+        step = cls.EXPORT_CHUNK_ROWS
+        with open(output_path, 'w', encoding='utf-8-sig', newline='',
+                  buffering=1024 * 1024) as f:
             writer = csv.DictWriter(f, fieldnames=fieldnames)
             writer.writeheader()
-            writer.writerows(records)
+            for start in range(0, len(records), step):
+                if stop_check and stop_check():
+                    break
+                writer.writerows(records[start:start + step])
+                if progress_callback:
+                    progress_callback(min(start + step, len(records)))
+        if stop_check and stop_check():
+            os.remove(output_path)
+            raise InterruptedError(f'CSV 出力中断: {output_path}')
 
     # ------------------------------------------------------------------
     # Utilities
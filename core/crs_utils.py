@@ -6,17 +6,36 @@ from qgis.core import (
     QgsProject, QgsPointXY, QgsRectangle, QgsVectorLayer,
 )
 
+# 日本国内判定用の範囲 (EPSG:4326)
+JAPAN_LAT_RANGE = (20.0, 46.0)
+JAPAN_LON_RANGE = (122.0, 154.0)
 
-def canvas_center_to_4326(iface) -> QgsPointXY:
-    """マップキャンバスの中心座標を EPSG:4326 に変換して返す."""
+
+def in_japan(lat: float, lon: float) -> bool:
+    """緯度経度 (EPSG:4326) が日本の概略範囲内か."""
+    return (JAPAN_LAT_RANGE[0] <= lat <= JAPAN_LAT_RANGE[1]
+            and JAPAN_LON_RANGE[0] <= lon <= JAPAN_LON_RANGE[1])
+
+
+_CRS_4326 = QgsCoordinateReferenceSystem('EPSG:4326')
+
+
+def canvas_center_to_4326(iface, transform_for=None) -> QgsPointXY:
+    """マップキャンバスの中心座標を EPSG:4326 に変換して返す.
+
+    transform_for(src_crs, dst_crs) を渡すと、呼出側でキャッシュした
+    QgsCoordinateTransform を使う（呼出毎の変換オブジェクト生成を避ける）。
+    """
     canvas = iface.mapCanvas()
     center = canvas.center()
     src_crs = canvas.mapSettings().destinationCrs()
-    dst_crs = QgsCoordinateReferenceSystem('EPSG:4326')
-    if src_crs != dst_crs:
-        transform = QgsCoordinateTransform(
-            src_crs, dst_crs, QgsProject.instance()
-        )
+    if src_crs != _CRS_4326:
+        if transform_for is not None:
+            transform = transform_for(src_crs, _CRS_4326)
+        else:
+            transform = QgsCoordinateTransform(
+                src_crs, _CRS_4326, QgsProject.instance()
+            )
         center = transform.transform(center)
     return center
 
@@ -6,50 +6,17 @@
 """
 
 import os
+import threading
 import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Optional, Callable
 from urllib.request import urlopen, Request
 from urllib.error import HTTPError, URLError
 
 from qgis.core import QgsVectorLayer, QgsMessageLog, Qgis
 
+from .kokudo_datasets import KOKUDO_DATASETS
 
-# Supported datasets
-# year_style: '4digit' = 2024, '2digit' = 24
-# date_suffix: N03 uses '0101' after year
-# scope: 'pref' = per-prefecture, 'national' = single national file
-KOKUDO_DATASETS = {
-    'N03': {
-        'name': '行政区域', 'category': '行政',
-        'year_style': '4digit', 'date_suffix': '0101', 'scope': 'pref',
-        'years': ['2025', '2024', '2023', '2022'],
-    },
-    'L01': {
-        'name': '地価公示', 'category': '地価',
-        'year_style': '2digit', 'date_suffix': '', 'scope': 'pref',
-        'years': ['2021', '2020', '2019', '2018'],
-    },
-    'L02': {
-        'name': '都道府県地価調査', 'category': '地価',
-        'year_style': '2digit', 'date_suffix': '', 'scope': 'pref',
-        'years': ['2021', '2020', '2019', '2018'],
-    },
-    'N02': {
-        'name': '鉄道', 'category': '交通',
-        'year_style': '2digit', 'date_suffix': '', 'scope': 'national',
-        'years': ['2022', '2021', '2020', '2019'],
-    },
-    'A31': {
-        'name': '洪水浸水想定区域', 'category': '災害',
-        'year_style': '2digit', 'date_suffix': '', 'scope': 'bureau',
-        'years': ['2020', '2019', '2018', '2017'],
-    },
-    'A33': {
-        'name': '土砂災害警戒区域', 'category': '災害',
-        'year_style': '2digit', 'date_suffix': '', 'scope': 'pref',
-        'years': ['2020', '2019', '2018', '2017'],
-    },
-}
 
 DL_BASE = 'https://nlftp.mlit.go.jp/ksj/gml/data'
 
@@ -71,6 +38,9 @@ PREF_TO_BUREAU = {
 class KokudoApiClient:
     """Client for National Land Numerical Information direct downloads."""
 
+    # 複数地域ダウンロード時の最大並列数
+    _MAX_THREADS = 8
+
     @staticmethod
     def _log(msg, level=Qgis.Info):
         QgsMessageLog.logMessage(msg, 'JLSA-Kokudo', level)
@@ -320,135 +290,175 @@ class KokudoApiClient:
                                 fiscal_year: str = '',
                                 cache_manager=None,
                                 progress_callback: Optional[Callable] = None,
+                                stop_check: Optional[Callable] = None,
                                 ) -> List[tuple]:
         """Download dataset and return (extract_dir, dataset_id, area_code) tuples.
 
         Does NOT create QgsVectorLayer — safe to call from worker threads.
+        stop_check が True を返すと未着手の地域をスキップして中断する。
+        progress_callback には (受信バイト数, 総バイト数) を渡す。総バイト数は
+        Content-Length が判明した地域の合計で、ダウンロード開始に伴い増える。
         """
         ds = KOKUDO_DATASETS.get(dataset_id)
         if not ds:
             self._log(f'Unknown dataset: {dataset_id}', Qgis.Warning)
             return []
 
+        byte_progress = self._make_byte_progress(progress_callback)
+
         if ds.get('scope') == 'national':
-            result = self._download_national_path(
-                dataset_id, fiscal_year, cache_manager, progress_callback)
+            result = self._download_area_path(
+                dataset_id, 'national', fiscal_year, cache_manager,
+                stop_check, byte_progress)
             return [result] if result else []
 
         # bureauスコープの場合、整備局コードに変換（重複除去）
         area_codes = self._resolve_area_codes(dataset_id, pref_codes)
-        results = []
-        total = len(area_codes)
-
-        for idx, area in enumerate(area_codes):
-            if progress_callback:
-                progress_callback(idx, total)
-
-            cache_key = f'kokudo_{dataset_id}_{area}_{fiscal_year}'
-            cached = (cache_manager.get_cached_file(cache_key)
-                      if cache_manager else None)
-            if cached:
-                self._log(f'Using cached file for {dataset_id}/{area}')
-                results.append((cached, dataset_id, area))
-                continue
-
-            dl_url = self._find_download_url(dataset_id, area, fiscal_year)
-            if not dl_url:
-                self._log(f'No download URL for {dataset_id}/{area}',
-                          Qgis.Warning)
-                continue
-
-            download_dir = (cache_manager.get_download_dir()
-                            if cache_manager
-                            else os.path.join(os.path.expanduser('~'),
-                                              '.jlsa_tmp'))
-            os.makedirs(download_dir, exist_ok=True)
-            zip_path = os.path.join(download_dir, f'{dataset_id}_{area}.zip')
-
-            try:
-                self._download_file(dl_url, zip_path)
-            except Exception as e:
-                self._log(f'Download error: {e}', Qgis.Warning)
-                continue
-
-            extract_dir = os.path.join(download_dir, f'{dataset_id}_{area}')
-            os.makedirs(extract_dir, exist_ok=True)
-            try:
-                with zipfile.ZipFile(zip_path, 'r') as zf:
-                    zf.extractall(extract_dir)
-            except Exception as e:
-                self._log(f'Extract error: {e}', Qgis.Warning)
-                continue
-
-            if cache_manager:
-                cache_manager.register(cache_key, extract_dir,
-                                       dataset=dataset_id, pref=area)
-
-            results.append((extract_dir, dataset_id, area))
-
-        if progress_callback:
-            progress_callback(total, total)
-
-        return results
-
-    def _download_national_path(self, dataset_id, fiscal_year,
-                                 cache_manager, progress_callback):
-        """Download national dataset, return (dir, id, 'national') or None."""
-        if progress_callback:
-            progress_callback(0, 1)
-
-        cache_key = f'kokudo_{dataset_id}_national_{fiscal_year}'
-        cached = (cache_manager.get_cached_file(cache_key)
-                  if cache_manager else None)
-        if cached:
-            if progress_callback:
-                progress_callback(1, 1)
-            return (cached, dataset_id, 'national')
+        if not area_codes:
+            return []
 
-        dl_url = self._find_download_url(dataset_id, '', fiscal_year)
-        if not dl_url:
-            if progress_callback:
-                progress_callback(1, 1)
+        # I/O 待ちが支配的なので地域ごとのダウンロードを並列実行
+        by_area = {}
+        workers = min(self._MAX_THREADS, len(area_codes))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(self._download_area_path, dataset_id, area,
+                            fiscal_year, cache_manager, stop_check,
+                            byte_progress): area
+                for area in area_codes
+            }
+            for fut in as_completed(futures):
+                if stop_check and stop_check():
+                    for pending in futures:
+                        pending.cancel()
+                area = futures[fut]
+                if fut.cancelled():
+                    continue
+                try:
+                    by_area[area] = fut.result()
+                except Exception as e:
+                    self._log(f'Download error ({dataset_id}/{area}): {e}',
+                              Qgis.Warning)
+
+        # 結果は選択順で返す
+        return [by_area[a] for a in area_codes if by_area.get(a)]
+
+    def _download_area_path(self, dataset_id, area, fiscal_year,
+                            cache_manager, stop_check=None,
+                            byte_progress=None):
+        """1地域分をダウンロード・展開し (dir, id, area) or None を返す.
+
+        展開先は (dataset_id, fiscal_year, area) ごとに固定で、展開完了時に
+        マーカーファイルを置く。マーカーがあれば通信せずに再利用する。
+        """
+        if stop_check and stop_check():
             return None
-
         download_dir = (cache_manager.get_download_dir()
                         if cache_manager
                         else os.path.join(os.path.expanduser('~'),
                                           '.jlsa_tmp'))
-        os.makedirs(download_dir, exist_ok=True)
-        zip_path = os.path.join(download_dir, f'{dataset_id}_national.zip')
+        extract_dir = self.cache_dir_for(download_dir, dataset_id,
+                                         fiscal_year, area)
+        cache_key = f'kokudo_{dataset_id}_{area}_{fiscal_year}'
+        if os.path.exists(os.path.join(extract_dir, self.EXTRACTED_MARKER)):
+            self._log(f'Using cached file for {dataset_id}/{area}')
+            return (extract_dir, dataset_id, area)
+
+        lookup_code = '' if area == 'national' else area
+        dl_url = self._find_download_url(dataset_id, lookup_code, fiscal_year)
+        if not dl_url:
+            self._log(f'No download URL for {dataset_id}/{area}',
+                      Qgis.Warning)
+            return None
+
+        os.makedirs(extract_dir, exist_ok=True)
+        zip_path = f'{extract_dir}.zip'
 
         try:
-            self._download_file(dl_url, zip_path)
+            on_bytes = (
+                (lambda done, size: byte_progress(area, done, size))
+                if byte_progress else None
+            )
+            self._download_file(dl_url, zip_path, stop_check, on_bytes)
         except Exception as e:
             self._log(f'Download error: {e}', Qgis.Warning)
-            if progress_callback:
-                progress_callback(1, 1)
             return None
 
-        extract_dir = os.path.join(download_dir, f'{dataset_id}_national')
-        os.makedirs(extract_dir, exist_ok=True)
         try:
             with zipfile.ZipFile(zip_path, 'r') as zf:
                 zf.extractall(extract_dir)
+            open(os.path.join(extract_dir, self.EXTRACTED_MARKER), 'w').close()
         except Exception as e:
             self._log(f'Extract error: {e}', Qgis.Warning)
-            if progress_callback:
-                progress_callback(1, 1)
             return None
+        finally:
+            if os.path.exists(zip_path):
+                os.remove(zip_path)
 
         if cache_manager:
             cache_manager.register(cache_key, extract_dir,
-                                   dataset=dataset_id, pref='national')
-        if progress_callback:
-            progress_callback(1, 1)
-        return (extract_dir, dataset_id, 'national')
+                                   dataset=dataset_id, pref=area,
+                                   url=dl_url)
+
+        return (extract_dir, dataset_id, area)
+
+    @staticmethod
+    def _make_byte_progress(progress_callback):
+        """地域ごとの受信バイト数を集計して progress_callback に流す関数を返す.
+
+        ワーカースレッドから同時に呼ばれるためロックで保護する。
+        Content-Length のない地域がある間は total=0（不確定）を渡す。
+        """
+        if not progress_callback:
+            return None
+        lock = threading.Lock()
+        received = {}
+        sizes = {}
+        unknown = set()
+
+        def report(area, done, size):
+            with lock:
+                received[area] = done
+                if size:
+                    sizes[area] = size
+                    unknown.discard(area)
+                else:
+                    unknown.add(area)
+                current = sum(received.values())
+                total = 0 if unknown else max(sum(sizes.values()), current)
+            progress_callback(current, total)
+
+        return report
+
+    # ------------------------------------------------------------------
+    # On-disk cache layout
+    # ------------------------------------------------------------------
+
+    CACHE_SUBDIR = 'kokudo'
+    EXTRACTED_MARKER = 'extracted.marker'
+
+    @classmethod
+    def cache_dir_for(cls, download_dir: str, dataset_id: str,
+                      fiscal_year: str, area: str) -> str:
+        """(dataset_id, fiscal_year, area) に対応する展開先ディレクトリ."""
+        return os.path.join(download_dir, cls.CACHE_SUBDIR, dataset_id,
+                            fiscal_year or 'latest', area)
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
 
-    def _download_file(self, url: str, dest: str):
+    # progress 通知の間隔 (バイト)
+    _PROGRESS_STEP = 1024 * 1024
+
+    def _download_file(self, url: str, dest: str,
+                       stop_check: Optional[Callable] = None,
+                       on_bytes: Optional[Callable] = None):
+        """url を dest に保存. 中断時は途中のファイルを削除して InterruptedError.
+
+        on_bytes があれば (受信バイト数, Content-Length or 0) を
+        約 1 MB ごとと完了時に通知する。
+        """
         req = Request(url, headers={'User-Agent': 'JLSA-QGISPlugin/1.0'})
         with urlopen(req, timeout=300) as resp:
             total_size = resp.headers.get('Content-Length')
@@ -457,16 +467,45 @@ class KokudoApiClient:
                 self._log(f'ダウンロード開始: {url} ({total_size / 1024 / 1024:.1f} MB)')
             else:
                 self._log(f'ダウンロード開始: {url}')
+            size = total_size or 0
             downloaded = 0
+            next_report = 0
             with open(dest, 'wb') as f:
                 while True:
+                    if stop_check and stop_check():
+                        break
                     chunk = resp.read(65536)
                     if not chunk:
                         break
                     f.write(chunk)
                     downloaded += len(chunk)
+                    if on_bytes and downloaded >= next_report:
+                        on_bytes(downloaded, size)
+                        next_report = downloaded + self._PROGRESS_STEP
+            if on_bytes:
+                on_bytes(downloaded, size)
+            if stop_check and stop_check():
+                os.remove(dest)
+                raise InterruptedError(f'ダウンロード中断: {url}')
             self._log(f'ダウンロード完了: {dest} ({downloaded / 1024 / 1024:.1f} MB)')
 
+    @staticmethod
+    def prepare_layer_source(directory: str, dataset_id: str,
+                             pref_code: str) -> Optional[tuple]:
+        """読込対象ファイルを特定し、空間インデックスを作成する.
+
+        ワーカースレッド用。レイヤ自体は返さず (path, layer_name) を返すので、
+        呼出側はメインスレッドでレイヤを作成すること。
+        """
+        layer = KokudoApiClient._load_shapefile_dir(
+            directory, dataset_id, pref_code)
+        if not layer:
+            return None
+        dp = layer.dataProvider()
+        if dp.capabilities() & dp.CreateSpatialIndex:
+            dp.createSpatialIndex()
+        return (layer.source(), layer.name())
+
     @staticmethod
     def _load_shapefile_dir(directory: str, dataset_id: str,
                             pref_code: str) -> Optional[QgsVectorLayer]:
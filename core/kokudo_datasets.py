@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""国土数値情報データセット定義.
+
+UI・Processing の登録時に読むためクライアント本体から分離している。
+"""
+
+# Supported datasets
+# year_style: '4digit' = 2024, '2digit' = 24
+# date_suffix: N03 uses '0101' after year
+# scope: 'pref' = per-prefecture, 'national' = single national file
+KOKUDO_DATASETS = {
+    'N03': {
+        'name': '行政区域', 'category': '行政',
+        'year_style': '4digit', 'date_suffix': '0101', 'scope': 'pref',
+        'years': ['2025', '2024', '2023', '2022'],
+    },
+    'L01': {
+        'name': '地価公示', 'category': '地価',
+        'year_style': '2digit', 'date_suffix': '', 'scope': 'pref',
+        'years': ['2021', '2020', '2019', '2018'],
+    },
+    'L02': {
+        'name': '都道府県地価調査', 'category': '地価',
+        'year_style': '2digit', 'date_suffix': '', 'scope': 'pref',
+        'years': ['2021', '2020', '2019', '2018'],
+    },
+    'N02': {
+        'name': '鉄道', 'category': '交通',
+        'year_style': '2digit', 'date_suffix': '', 'scope': 'national',
+        'years': ['2022', '2021', '2020', '2019'],
+    },
+    'A31': {
+        'name': '洪水浸水想定区域', 'category': '災害',
+        'year_style': '2digit', 'date_suffix': '', 'scope': 'bureau',
+        'years': ['2020', '2019', '2018', '2017'],
+    },
+    'A33': {
+        'name': '土砂災害警戒区域', 'category': '災害',
+        'year_style': '2digit', 'date_suffix': '', 'scope': 'pref',
+        'years': ['2020', '2019', '2018', '2017'],
+    },
+}
@@ -1,10 +1,17 @@
 # -*- coding: utf-8 -*-
 """不動産情報ライブラリ API client."""
 
+import http.client
 import json
 import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional, Dict
-from urllib.request import urlopen, Request
+from urllib.parse import unquote, urljoin, urlsplit
+from urllib.request import getproxies, proxy_bypass
 
 from qgis.core import (
     QgsVectorLayer, QgsFeature, QgsGeometry, QgsField,
@@ -20,12 +27,38 @@ API_BASE = 'https://www.reinfolib.mlit.go.jp/ex-api/external'
 class LandPriceApiClient:
     """Client for the Real Estate Information Library API."""
 
+    # タイル取得の同時実行数 (接続はスレッドごとに保持される)
+    _MAX_THREADS = 8
+    # タイル応答キャッシュ: メモリ上の件数上限とディスク上の有効期間
+    TILE_CACHE_SIZE = 1024
+    TILE_CACHE_TTL = 30 * 24 * 3600
+    # 0件のタイル (未公表の年など) はディスクに残さず、メモリ上も短時間のみ
+    EMPTY_TILE_TTL = 3600
+
     @staticmethod
     def _log(msg, level=Qgis.Info):
         QgsMessageLog.logMessage(msg, 'JLSA-LandPrice', level)
 
-    def __init__(self, api_key: str = ''):
+    def __init__(self, api_key: str = '', cache_dir: Optional[str] = None):
+        """cache_dir を指定するとタイル応答をディスクにも保存する."""
         self.api_key = api_key
+        self.cache_dir = cache_dir
+        # (z, x, y, year, pc) -> (dict, 有効期限 epoch 秒)
+        self._tile_cache = OrderedDict()
+        self._tile_lock = threading.Lock()
+        # keep-alive 接続をホストごとにプールし、
+        # タイル毎の TCP/TLS ハンドシェイクを避ける
+        self._idle = {}         # host -> 未使用の接続リスト
+        self._connections = []  # 作成した全接続 (close 用)
+        self._conn_lock = threading.Lock()
+
+    def close(self):
+        """保持している HTTP 接続をすべて閉じる."""
+        with self._conn_lock:
+            connections, self._connections = self._connections, []
+            self._idle = {}
+        for conn in connections:
+            conn.close()
 
     # ------------------------------------------------------------------
     # Tile-based retrieval
@@ -38,23 +71,34 @@ class LandPriceApiClient:
         """Fetch land price GeoJSON for a map tile.
 
         price_classification: 0=地価公示, 1=都道府県地価調査, None=両方
+        取得済みのタイルはメモリ / ディスクキャッシュから返す。
         """
+        key = (z, x, y, year, price_classification)
+        data = self._cached_tile(key)
+        if data is not None:
+            return data
+
         url = (f'{API_BASE}/XPT002?response_format=geojson'
                f'&z={z}&x={x}&y={y}&year={year}')
         if price_classification is not None:
             url += f'&priceClassification={price_classification}'
         self._log(f'API URL: {url}')
-        return self._fetch_json(url)
+        data = self._fetch_json(url)
+        if data is not None:
+            self._store_tile(key, data)
+        return data
 
     def fetch_prices_for_extent(self, xmin: float, ymin: float,
                                 xmax: float, ymax: float,
                                 zoom: int = 13,
                                 year: int = 2024,
                                 price_classification: Optional[int] = None,
+                                cancel_cb=None,
                                 ) -> List[dict]:
         """Fetch land prices covering a bounding box (EPSG:4326 coords).
 
         price_classification: 0=地価公示, 1=都道府県地価調査, None=両方
+        cancel_cb: True を返すと残りのタイル取得を打ち切る
         """
         self._log(f'fetch_prices_for_extent: extent=({xmin:.6f}, {ymin:.6f}, '
                   f'{xmax:.6f}, {ymax:.6f}), zoom={zoom}, year={year}, '
@@ -68,10 +112,26 @@ class LandPriceApiClient:
 
         all_features = []
         seen_ids = set()
-
-        for i, (tx, ty) in enumerate(tiles):
-            self._log(f'タイル取得中 [{i+1}/{len(tiles)}]: z={zoom}, x={tx}, y={ty}')
-            data = self.fetch_land_prices(zoom, tx, ty, year, price_classification)
+        if not tiles:
+            return all_features
+
+        def fetch_tile(tile):
+            if cancel_cb and cancel_cb():
+                return None
+            tx, ty = tile
+            self._log(f'タイル取得中: z={zoom}, x={tx}, y={ty}')
+            return self.fetch_land_prices(zoom, tx, ty, year,
+                                          price_classification)
+
+        # RTT 待ちを重ねるためタイルを並列取得（結果はタイル順に処理）
+        workers = min(self._MAX_THREADS, len(tiles))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            responses = list(pool.map(fetch_tile, tiles))
+        if cancel_cb and cancel_cb():
+            self._log('タイル取得を中止しました')
+            return []
+
+        for data in responses:
             if data and 'features' in data:
                 count = len(data['features'])
                 self._log(f'  → {count} features取得')
@@ -183,22 +243,174 @@ class LandPriceApiClient:
                 tiles.append((tx, ty))
         return tiles
 
+    # ------------------------------------------------------------------
+    # Tile cache
+    # ------------------------------------------------------------------
+
+    def _tile_path(self, key) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        z, x, y, year, pc = key
+        return os.path.join(self.cache_dir, str(z), str(x),
+                            f'{y}_{year}_{"all" if pc is None else pc}.json')
+
+    @staticmethod
+    def _is_empty_tile(data: dict) -> bool:
+        return not data.get('features')
+
+    def _cached_tile(self, key) -> Optional[dict]:
+        with self._tile_lock:
+            entry = self._tile_cache.get(key)
+            if entry is not None:
+                data, expires = entry
+                if time.time() < expires:
+                    self._tile_cache.move_to_end(key)
+                    return data
+                del self._tile_cache[key]
+
+        path = self._tile_path(key)
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            if time.time() - os.path.getmtime(path) > self.TILE_CACHE_TTL:
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception:
+            return None
+        if self._is_empty_tile(data):
+            return None  # 以前の版で保存された0件タイルは使わない
+        self._remember_tile(key, data)
+        return data
+
+    def _store_tile(self, key, data: dict):
+        self._remember_tile(key, data)
+        path = self._tile_path(key)
+        if not path or self._is_empty_tile(data):
+            return
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+        except Exception as e:
+            self._log(f'タイルキャッシュ保存失敗: {e}', Qgis.Warning)
+
+    def _remember_tile(self, key, data: dict):
+        expires = (time.time() + self.EMPTY_TILE_TTL
+                   if self._is_empty_tile(data) else float('inf'))
+        with self._tile_lock:
+            self._tile_cache[key] = (data, expires)
+            self._tile_cache.move_to_end(key)
+            while len(self._tile_cache) > self.TILE_CACHE_SIZE:
+                self._tile_cache.popitem(last=False)
+
     # ------------------------------------------------------------------
     # HTTP
     # ------------------------------------------------------------------
 
+    def _acquire(self, host: str) -> http.client.HTTPSConnection:
+        """プールから接続を取り出す（空なら作成）."""
+        with self._conn_lock:
+            idle = self._idle.get(host)
+            if idle:
+                return idle.pop()
+            conn = self._connect(host)
+            self._connections.append(conn)
+            return conn
+
+    @staticmethod
+    def _connect(host: str) -> http.client.HTTPSConnection:
+        """host への接続を作る. システム/環境変数のプロキシがあれば CONNECT で経由.
+
+        urlopen と同じく getproxies() / proxy_bypass() に従う。
+        """
+        proxy = getproxies().get('https')
+        if not proxy or proxy_bypass(host.split(':')[0]):
+            return http.client.HTTPSConnection(host, timeout=30)
+        if '://' not in proxy:
+            proxy = f'http://{proxy}'
+        parts = urlsplit(proxy)
+        headers = {}
+        if parts.username:
+            import base64
+            cred = f'{unquote(parts.username)}:{unquote(parts.password or "")}'
+            headers['Proxy-Authorization'] = (
+                'Basic ' + base64.b64encode(cred.encode('utf-8')).decode('ascii'))
+        conn = http.client.HTTPSConnection(
+            parts.hostname,
+            parts.port or (443 if parts.scheme == 'https' else 80),
+            timeout=30)
+        conn.set_tunnel(host, headers=headers)
+        return conn
+
+    def _release(self, host: str, conn: http.client.HTTPSConnection):
+        with self._conn_lock:
+            if conn in self._connections:  # close() 済みなら戻さない
+                self._idle.setdefault(host, []).append(conn)
+
+    def _discard(self, conn: http.client.HTTPSConnection):
+        """接続を閉じてプールから外す（読みかけの応答を再利用しない）."""
+        conn.close()
+        with self._conn_lock:
+            if conn in self._connections:
+                self._connections.remove(conn)
+
+    _MAX_REDIRECTS = 5
+    _REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+    def _get(self, url: str):
+        """GET して (status, body) を返す. リダイレクトは urlopen 同様に辿る."""
+        for _ in range(self._MAX_REDIRECTS + 1):
+            status, body, location = self._get_once(url)
+            if status not in self._REDIRECT_STATUSES or not location:
+                return status, body
+            url = urljoin(url, location)
+            if urlsplit(url).scheme != 'https':
+                raise http.client.HTTPException(
+                    f'HTTPS 以外へのリダイレクト: {url}')
+        raise http.client.HTTPException(f'リダイレクトが多すぎます: {url}')
+
+    def _get_once(self, url: str):
+        """1回の GET で (status, body, Location) を返す.
+
+        切断済みの keep-alive は1回だけ再接続する。タイムアウト等で失敗した
+        接続はプールに戻さない。
+        """
+        parts = urlsplit(url)
+        path = f'{parts.path}?{parts.query}' if parts.query else parts.path
+        headers = {'User-Agent': 'JLSA-QGISPlugin/1.0'}
+        if self.api_key:
+            headers['Ocp-Apim-Subscription-Key'] = self.api_key
+        conn = self._acquire(parts.netloc)
+        reusable = False
+        try:
+            for attempt in (1, 2):
+                try:
+                    conn.request('GET', path, headers=headers)
+                    resp = conn.getresponse()
+                    body = resp.read()
+                except (http.client.HTTPException, ConnectionError):
+                    conn.close()
+                    if attempt == 2:
+                        raise
+                    continue
+                reusable = not resp.will_close
+                return resp.status, body, resp.getheader('Location')
+        finally:
+            if reusable:
+                self._release(parts.netloc, conn)
+            else:
+                self._discard(conn)
+
     def _fetch_json(self, url: str) -> Optional[dict]:
         try:
-            headers = {'User-Agent': 'JLSA-QGISPlugin/1.0'}
-            if self.api_key:
-                headers['Ocp-Apim-Subscription-Key'] = self.api_key
-            req = Request(url, headers=headers)
-            with urlopen(req, timeout=30) as resp:
-                status = resp.getcode()
-                body = resp.read().decode('utf-8')
-                self._log(f'HTTP {status}, body length={len(body)}')
-                data = json.loads(body)
-                return data
+            status, raw = self._get(url)
+            body = raw.decode('utf-8')
+            self._log(f'HTTP {status}, body length={len(body)}')
+            if status >= 400:
+                raise http.client.HTTPException(f'HTTP Error {status}')
+            data = json.loads(body)
+            return data
         except Exception as e:
             self._log(f'API error [{type(e).__name__}]: {e}', Qgis.Warning)
             self._log(f'  URL: {url}', Qgis.Warning)
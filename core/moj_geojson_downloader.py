@@ -4,13 +4,18 @@
 import json
 import os
 import re
-from typing import List, Dict, Optional, Tuple
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing
+from typing import Callable, List, Dict, Optional, Tuple
 from urllib.request import urlopen, Request
 
 from qgis.core import (
     QgsVectorLayer, QgsMessageLog, Qgis,
     QgsVectorFileWriter, QgsCoordinateTransformContext,
-    QgsVectorSimplifyMethod,
+    QgsVectorSimplifyMethod, QgsFeatureSource,
 )
 
 
@@ -19,10 +24,26 @@ GSI_REVERSE_GEOCODER = (
     'https://mreversegeocoder.gsi.go.jp/reverse-geocoder/LonLatToAddress'
 )
 
+# ダウンロード済み GeoJSON/GPKG キャッシュの有効期間 (秒)
+MOJ_CACHE_TTL = 30 * 24 * 3600
+
+# 逆ジオコーダー結果のメモ (丸めた lat/lon -> 市区町村コード)。成功時のみ保持
+CITY_CODE_CACHE_SIZE = 256
+_city_code_cache: 'OrderedDict[Tuple[float, float], str]' = OrderedDict()
+# GUI スレッドと QThreadPool の両方から更新されるため
+_city_code_lock = threading.Lock()
+
+# 逆ジオコーダー結果の永続キャッシュ (cache_dir 配下の SQLite)
+CITY_CODE_DB_NAME = 'city_codes.sqlite'
+
 
 class MojGeoJsonDownloader:
     """登記所備付地図 GeoJSON のダウンロード・読込."""
 
+    def __init__(self, cache_dir: Optional[str] = None):
+        """cache_dir を指定すると逆ジオコーダー結果をディスクにも保存する."""
+        self.cache_dir = cache_dir
+
     @staticmethod
     def _log(msg, level=Qgis.Info):
         QgsMessageLog.logMessage(msg, 'JLSA-MojGeoJson', level)
@@ -36,9 +57,21 @@ class MojGeoJsonDownloader:
 
         最大3回リトライし、タイムアウト耐性を高めている。
 
+        同じ地点 (小数4桁≒10m) の結果はプロセス内でメモし、再問い合わせしない。
+        cache_dir があればセッションをまたいで SQLite にも保持する。
+
         Returns:
             '13104' 等の市区町村コード文字列、または None
         """
+        key = (round(lat, 4), round(lon, 4))
+        with _city_code_lock:
+            cached = _city_code_cache.get(key)
+        if not cached:
+            cached = self._load_city_code(key)
+        if cached:
+            self._remember_city_code(key, cached)
+            return cached
+
         url = f'{GSI_REVERSE_GEOCODER}?lat={lat}&lon={lon}'
         last_error = None
         for attempt in range(3):
@@ -52,6 +85,8 @@ class MojGeoJsonDownloader:
                 muniCd = results.get('muniCd', '')
                 if muniCd:
                     self._log(f'市区町村コード: {muniCd} (lat={lat}, lon={lon})')
+                    self._remember_city_code(key, muniCd)
+                    self._store_city_code(key, muniCd)
                     return muniCd
                 self._log(
                     f'逆ジオコーダー: コード未取得 response={data}',
@@ -65,6 +100,52 @@ class MojGeoJsonDownloader:
         self._log(f'逆ジオコーダー 全リトライ失敗: {last_error}', Qgis.Warning)
         return None
 
+    @staticmethod
+    def _remember_city_code(key, city_code: str):
+        with _city_code_lock:
+            _city_code_cache[key] = city_code
+            _city_code_cache.move_to_end(key)
+            if len(_city_code_cache) > CITY_CODE_CACHE_SIZE:
+                _city_code_cache.popitem(last=False)
+
+    def _city_code_db(self):
+        """永続キャッシュへの接続 (呼出側で close)。cache_dir 未指定なら None."""
+        if not self.cache_dir:
+            return None
+        os.makedirs(self.cache_dir, exist_ok=True)
+        conn = sqlite3.connect(
+            os.path.join(self.cache_dir, CITY_CODE_DB_NAME), timeout=5)
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS city_code '
+            '(key TEXT PRIMARY KEY, code TEXT NOT NULL)')
+        return conn
+
+    def _load_city_code(self, key) -> Optional[str]:
+        try:
+            conn = self._city_code_db()
+            if conn is None:
+                return None
+            with closing(conn):
+                row = conn.execute(
+                    'SELECT code FROM city_code WHERE key = ?',
+                    (f'{key[0]}:{key[1]}',)).fetchone()
+        except (OSError, sqlite3.Error) as e:
+            self._log(f'市区町村コードキャッシュ読込失敗: {e}', Qgis.Warning)
+            return None
+        return row[0] if row else None
+
+    def _store_city_code(self, key, city_code: str):
+        try:
+            conn = self._city_code_db()
+            if conn is None:
+                return
+            with closing(conn), conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO city_code (key, code) VALUES (?, ?)',
+                    (f'{key[0]}:{key[1]}', city_code))
+        except (OSError, sqlite3.Error) as e:
+            self._log(f'市区町村コードキャッシュ保存失敗: {e}', Qgis.Warning)
+
     # ------------------------------------------------------------------
     # CKAN API → GeoJSON リソース一覧
     # ------------------------------------------------------------------
@@ -142,9 +223,13 @@ class MojGeoJsonDownloader:
     # ダウンロード
     # ------------------------------------------------------------------
 
-    def download_geojson(self, url: str, dest_path: str) -> str:
+    def download_geojson(self, url: str, dest_path: str,
+                         stop_check: Optional[Callable] = None) -> str:
         """GeoJSON をダウンロードしてローカルに保存.
 
+        stop_check が True を返した場合は途中のファイルを削除し
+        InterruptedError を送出する。
+
         Returns:
             保存先パス
         """
@@ -153,10 +238,15 @@ class MojGeoJsonDownloader:
         with urlopen(req, timeout=120) as resp:
             with open(dest_path, 'wb') as f:
                 while True:
+                    if stop_check and stop_check():
+                        break
                     chunk = resp.read(8192)
                     if not chunk:
                         break
                     f.write(chunk)
+        if stop_check and stop_check():
+            os.remove(dest_path)
+            raise InterruptedError(f'ダウンロード中断: {url}')
         self._log(f'ダウンロード完了: {dest_path}')
         return dest_path
 
@@ -189,6 +279,7 @@ class MojGeoJsonDownloader:
         opts = QgsVectorFileWriter.SaveVectorOptions()
         opts.driverName = 'GPKG'
         opts.fileEncoding = 'UTF-8'
+        opts.layerOptions = ['SPATIAL_INDEX=YES']
 
         err, msg, _, _ = QgsVectorFileWriter.writeAsVectorFormatV3(
             tmp_layer, gpkg_path,
@@ -198,9 +289,27 @@ class MojGeoJsonDownloader:
             self._log(f'GPKG 変換失敗: {msg}', Qgis.Warning)
             return None
 
+        self._create_attribute_indexes(gpkg_path)
         self._log(f'GPKG 変換完了: {gpkg_path}')
         return gpkg_path
 
+    def _create_attribute_indexes(self, gpkg_path: str):
+        """地番検索に使う列へ SQLite インデックスを作成.
+
+        地番/大字名/字名 の等価検索式がプロバイダ側で索引検索になる。
+        """
+        layer = QgsVectorLayer(gpkg_path, 'tmp', 'ogr')
+        if not layer.isValid():
+            return
+        dp = layer.dataProvider()
+        if not dp.capabilities() & dp.CreateAttributeIndex:
+            return
+        fields = layer.fields()
+        for name in ('地番', '大字名', '字名'):
+            idx = fields.indexOf(name)
+            if idx >= 0 and not dp.createAttributeIndex(idx):
+                self._log(f'属性インデックス作成失敗: {name}', Qgis.Warning)
+
     # ------------------------------------------------------------------
     # レイヤ化
     # ------------------------------------------------------------------
@@ -228,9 +337,11 @@ class MojGeoJsonDownloader:
             self._log(f'レイヤ読込失敗: {load_path}', Qgis.Warning)
             return None
 
-        # 空間インデックスを明示的に作成（GPKG は通常自動だが念のため）
+        # 空間インデックスは GPKG なら R-tree が既にある。無い場合のみ作成
+        has_index = (layer.hasSpatialIndex()
+                     == QgsFeatureSource.SpatialIndexPresent)
         dp = layer.dataProvider()
-        if dp.capabilities() & dp.CreateSpatialIndex:
+        if not has_index and dp.capabilities() & dp.CreateSpatialIndex:
             dp.createSpatialIndex()
 
         # 縮尺依存描画: 1:25000 より広域ではポリゴンを描画しない
@@ -253,6 +364,49 @@ class MojGeoJsonDownloader:
         )
         return layer
 
+    # ------------------------------------------------------------------
+    # キャッシュ
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def cache_keys(city_code: str,
+                   preferred_year: str = '') -> Tuple[str, str]:
+        """(GPKG, GeoJSON) のキャッシュキー."""
+        year = preferred_year or 'latest'
+        return (f'moj_gpkg_{city_code}_{year}',
+                f'moj_geojson_{city_code}_{year}')
+
+    def find_cached(self, city_code: str, preferred_year: str = '',
+                    cache_manager=None) -> Optional[str]:
+        """有効期限内のキャッシュファイルパス（GPKG 優先）を返す."""
+        if not cache_manager:
+            return None
+        now = time.time()
+        for key in self.cache_keys(city_code, preferred_year):
+            path = cache_manager.get_cached_file(key)
+            if path and now - os.path.getmtime(path) < MOJ_CACHE_TTL:
+                return path
+        return None
+
+    @staticmethod
+    def _cache_prefixes(city_code: str):
+        return (f'moj_gpkg_{city_code}_', f'moj_geojson_{city_code}_')
+
+    def cached_paths(self, city_code: str, cache_manager) -> List[str]:
+        """市区町村のキャッシュ済みファイルパス（全年度分）."""
+        return [path for prefix in self._cache_prefixes(city_code)
+                for path in cache_manager.paths(prefix)]
+
+    def clear_cached(self, city_code: str, cache_manager) -> bool:
+        """市区町村のキャッシュ（全年度分）を削除. 削除があれば True."""
+        removed = False
+        for prefix in self._cache_prefixes(city_code):
+            for key in cache_manager.keys(prefix):
+                removed |= cache_manager.remove(key)
+        if removed:
+            self._log(f'MOJキャッシュ削除: {city_code}')
+        return removed
+
     # ------------------------------------------------------------------
     # 一括処理: 座標 → DL → レイヤ化
     # ------------------------------------------------------------------
@@ -263,6 +417,7 @@ class MojGeoJsonDownloader:
         lon: float,
         preferred_year: str = '',
         cache_manager=None,
+        stop_check: Optional[Callable] = None,
     ) -> Optional[QgsVectorLayer]:
         """マップ中心座標から登記所備付地図を自動取得してレイヤ化.
 
@@ -271,6 +426,7 @@ class MojGeoJsonDownloader:
             lon: 経度 (EPSG:4326)
             preferred_year: 希望年度 (空文字で最新)
             cache_manager: CacheManager インスタンス
+            stop_check: 中断要求を返す callable (各リクエスト間で確認)
 
         Returns:
             QgsVectorLayer or None
@@ -280,18 +436,16 @@ class MojGeoJsonDownloader:
         if not city_code:
             raise ValueError('市区町村コードを取得できませんでした。')
 
-        # 2. キャッシュ確認（GPKG 優先）
-        cache_key_gpkg = f'moj_gpkg_{city_code}_{preferred_year or "latest"}'
-        cache_key_json = f'moj_geojson_{city_code}_{preferred_year or "latest"}'
-        if cache_manager:
-            cached_gpkg = cache_manager.get_cached_file(cache_key_gpkg)
-            if cached_gpkg:
-                self._log(f'キャッシュ使用(GPKG): {cached_gpkg}')
-                return self.load_as_layer(cached_gpkg, f'登記所備付地図_{city_code}')
-            cached_json = cache_manager.get_cached_file(cache_key_json)
-            if cached_json:
-                self._log(f'キャッシュ使用(GeoJSON): {cached_json}')
-                return self.load_as_layer(cached_json, f'登記所備付地図_{city_code}')
+        # 2. キャッシュ確認（GPKG 優先・有効期限内のみ）
+        cache_key_gpkg, cache_key_json = self.cache_keys(
+            city_code, preferred_year)
+        cached = self.find_cached(city_code, preferred_year, cache_manager)
+        if cached:
+            self._log(f'キャッシュ使用: {cached}')
+            return self.load_as_layer(cached, f'登記所備付地図_{city_code}')
+
+        if stop_check and stop_check():
+            return None
 
         # 3. CKAN API でリソース一覧取得
         resources = self.get_geojson_resources(city_code)
@@ -305,6 +459,8 @@ class MojGeoJsonDownloader:
         if not result:
             raise ValueError('適切なGeoJSONリソースが見つかりません。')
         url, year = result
+        if stop_check and stop_check():
+            return None
 
         # 5. ダウンロード
         if cache_manager:
@@ -314,7 +470,7 @@ class MojGeoJsonDownloader:
             os.makedirs(download_dir, exist_ok=True)
 
         dest = os.path.join(download_dir, f'moj_{city_code}_{year}.geojson')
-        self.download_geojson(url, dest)
+        self.download_geojson(url, dest, stop_check)
 
         # 6. キャッシュ登録（GeoJSON）
         if cache_manager:
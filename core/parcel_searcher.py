@@ -1,17 +1,35 @@
 # -*- coding: utf-8 -*-
 """地番検索エンジン."""
 
+from collections import defaultdict
 from typing import List, Optional, Dict
 
 from qgis.core import (
-    QgsVectorLayer, QgsFeature, QgsFeatureRequest,
+    QgsVectorLayer, QgsFeature, QgsFeatureRequest, QgsFeatureSource,
     QgsRectangle, QgsPointXY, QgsExpression, QgsGeometry,
-    QgsMessageLog, Qgis,
+    QgsSpatialIndex, QgsMessageLog, Qgis, NULL,
 )
 
+# 属性インデックスに使うフィールド名
+OAZA_FIELD = '大字名'
+AZA_FIELD = '字名'
+CHIBAN_FIELD = '地番'
+
 
 class ParcelSearcher:
-    """Search parcels on a loaded vector layer."""
+    """Search parcels on a loaded vector layer.
+
+    Exact attribute lookups go through a per-layer index
+    (oaza -> aza -> chiban -> [fid]) built once with a geometry-less
+    request; point lookups use a QgsSpatialIndex when the data source
+    has none of its own. Both are cached by layer id until
+    :meth:`invalidate` is called.
+    """
+
+    def __init__(self):
+        self._attribute_index: Dict[str, Dict] = {}
+        self._spatial_index: Dict[str, QgsSpatialIndex] = {}
+        self._oaza_aza_map: Dict[str, Dict[str, List[str]]] = {}
 
     @staticmethod
     def _log(msg, level=Qgis.Info):
@@ -29,13 +47,28 @@ class ParcelSearcher:
         if not layer or not layer.isValid():
             return []
 
-        expr_parts = []
-        # Match parcel number (地番)
-        expr_parts.append(f'"地番" = \'{self._escape(parcel_number)}\'')
+        index = self._index_for(layer)
+        if index is not None:
+            oaza_groups = ([index.get(oaza, {})] if oaza
+                           else index.values())
+            fids = []
+            for aza_map in oaza_groups:
+                aza_groups = ([aza_map.get(aza, {})] if aza
+                              else aza_map.values())
+                for chiban_map in aza_groups:
+                    fids.extend(chiban_map.get(parcel_number, ()))
+            return self._features_by_ids(layer, fids)
+
+        # Provider-side filter: OGR compiles this to SQL, so a GeoPackage
+        # with attribute indexes (see convert_to_gpkg) answers by index seek
+        expr_parts = [QgsExpression.createFieldEqualityExpression(
+            CHIBAN_FIELD, parcel_number)]
         if oaza:
-            expr_parts.append(f'"大字名" = \'{self._escape(oaza)}\'')
+            expr_parts.append(QgsExpression.createFieldEqualityExpression(
+                OAZA_FIELD, oaza))
         if aza:
-            expr_parts.append(f'"字名" = \'{self._escape(aza)}\'')
+            expr_parts.append(QgsExpression.createFieldEqualityExpression(
+                AZA_FIELD, aza))
 
         expression = ' AND '.join(expr_parts)
         request = QgsFeatureRequest(QgsExpression(expression))
@@ -43,7 +76,12 @@ class ParcelSearcher:
 
     def search_like(self, layer: QgsVectorLayer,
                     keyword: str) -> List[QgsFeature]:
-        """Fuzzy search by keyword on 地番, 大字名, 字名."""
+        """Fuzzy search by keyword on 地番, 大字名, 字名.
+
+        Always an expression request, not the attribute index: the keyword
+        keeps its LIKE semantics (``%``/``_`` act as wildcards) and the
+        provider decides which 100 rows are returned.
+        """
         if not layer or not layer.isValid() or not keyword:
             return []
 
@@ -80,19 +118,24 @@ class ParcelSearcher:
             point.x() - buffer, point.y() - buffer,
             point.x() + buffer, point.y() + buffer,
         )
-        request = QgsFeatureRequest().setFilterRect(rect)
+        spatial_index = self._spatial_index_for(layer)
+        if spatial_index is not None:
+            fids = spatial_index.intersects(rect)
+            if not fids:
+                return None
+            request = QgsFeatureRequest().setFilterFids(fids)
+        else:
+            request = QgsFeatureRequest().setFilterRect(rect)
 
-        # 1st pass: exact contain check
-        for feature in layer.getFeatures(request):
-            if feature.geometry().contains(point):
-                return feature
-
-        # 2nd pass: nearest feature by distance
+        # Exact contain check; otherwise fall back to the nearest candidate
         pt_geom = QgsGeometry.fromPointXY(point)
         nearest = None
         nearest_dist = float('inf')
         for feature in layer.getFeatures(request):
-            dist = feature.geometry().distance(pt_geom)
+            geom = feature.geometry()
+            if geom.contains(point):
+                return feature
+            dist = geom.distance(pt_geom)
             if dist < nearest_dist:
                 nearest_dist = dist
                 nearest = feature
@@ -103,11 +146,17 @@ class ParcelSearcher:
     # Layer introspection
     # ------------------------------------------------------------------
 
-    @staticmethod
-    def get_unique_oaza(layer: QgsVectorLayer) -> List[str]:
-        """Get unique 大字名 values from a layer."""
+    def get_unique_oaza(self, layer: QgsVectorLayer) -> List[str]:
+        """Get unique 大字名 values from a layer.
+
+        Uses the provider's uniqueValues() (a DISTINCT query on OGR) rather
+        than building the attribute index for a single field.
+        """
         if not layer or not layer.isValid():
             return []
+        cached = self._attribute_index.get(layer.id())
+        if cached is not None:
+            return sorted(k for k in cached if k)
         idx = layer.fields().indexOf('大字名')
         if idx < 0:
             return []
@@ -115,46 +164,182 @@ class ParcelSearcher:
             str(v) for v in layer.uniqueValues(idx) if v
         ))
 
-    @staticmethod
-    def get_unique_aza(layer: QgsVectorLayer,
+    def get_unique_aza(self, layer: QgsVectorLayer,
                        oaza: str = '') -> List[str]:
         """Get unique 字名 values, optionally filtered by 大字名."""
         if not layer or not layer.isValid():
             return []
+        index = self._index_for(layer)
+        if index is not None:
+            groups = [index.get(oaza, {})] if oaza else index.values()
+            return sorted({k for aza_map in groups for k in aza_map if k})
         idx = layer.fields().indexOf('字名')
         if idx < 0:
             return []
 
         if oaza:
-            expr = QgsExpression(f'"大字名" = \'{oaza}\'')
+            expr = QgsExpression(f'"大字名" = \'{self._escape(oaza)}\'')
             request = QgsFeatureRequest(expr)
-            values = set()
-            for feat in layer.getFeatures(request):
-                v = feat.attribute('字名')
-                if v:
-                    values.add(str(v))
-            return sorted(values)
+            request.setFlags(QgsFeatureRequest.NoGeometry)
+            request.setSubsetOfAttributes([AZA_FIELD, OAZA_FIELD],
+                                          layer.fields())
+            return sorted({
+                str(v) for v in
+                (feat.attribute(AZA_FIELD) for feat in layer.getFeatures(request))
+                if v
+            })
 
         return sorted(set(
             str(v) for v in layer.uniqueValues(idx) if v
         ))
 
+    def get_oaza_aza_map(self, layer: QgsVectorLayer) -> Dict[str, List[str]]:
+        """Map each 大字名 to its sorted 字名 values, in one pass.
+
+        Keys are inserted in sorted order, so ``list(result)`` is the
+        same as :meth:`get_unique_oaza`. The result is cached per layer id
+        until :meth:`invalidate`.
+        """
+        if not layer or not layer.isValid():
+            return {}
+        lid = layer.id()
+        cached = self._oaza_aza_map.get(lid)
+        if cached is None:
+            cached = self._build_oaza_aza_map(layer)
+            self._oaza_aza_map[lid] = cached
+        return cached
+
+    def _build_oaza_aza_map(self, layer: QgsVectorLayer) -> Dict[str, List[str]]:
+        index = self._index_for(layer)
+        if index is not None:
+            return {oaza: sorted(k for k in index[oaza] if k)
+                    for oaza in sorted(index) if oaza}
+
+        fields = layer.fields()
+        oaza_idx = fields.indexOf(OAZA_FIELD)
+        aza_idx = fields.indexOf(AZA_FIELD)
+        if oaza_idx < 0:
+            return {}
+        if aza_idx < 0:
+            return {oaza: [] for oaza in self.get_unique_oaza(layer)}
+
+        request = QgsFeatureRequest()
+        request.setFlags(QgsFeatureRequest.NoGeometry)
+        request.setSubsetOfAttributes([oaza_idx, aza_idx])
+        grouped = defaultdict(set)
+        for feat in layer.getFeatures(request):
+            attrs = feat.attributes()
+            oaza = self._key(attrs[oaza_idx])
+            if not oaza:
+                continue
+            aza = self._key(attrs[aza_idx])
+            values = grouped[oaza]
+            if aza:
+                values.add(aza)
+        return {oaza: sorted(grouped[oaza]) for oaza in sorted(grouped)}
+
     # ------------------------------------------------------------------
     # Feature info extraction
     # ------------------------------------------------------------------
 
     @staticmethod
-    def feature_to_dict(feature: QgsFeature) -> Dict:
-        """Extract attribute dict from a feature."""
-        info = {}
-        for field in feature.fields():
-            info[field.name()] = feature.attribute(field.name())
-        return info
+    def feature_to_dict(feature: QgsFeature,
+                        field_names: Optional[List[str]] = None) -> Dict:
+        """Extract attribute dict from a feature.
+
+        Pass the layer's precomputed ``field_names`` to skip the per-call
+        field lookup; values are taken positionally from attributes().
+        """
+        if field_names is None:
+            field_names = feature.fields().names()
+        return dict(zip(field_names, feature.attributes()))
+
+    # ------------------------------------------------------------------
+    # Index cache
+    # ------------------------------------------------------------------
+
+    def invalidate(self, layer_id: Optional[str] = None):
+        """Drop cached indexes for one layer (or all when omitted)."""
+        if layer_id is None:
+            self._attribute_index.clear()
+            self._spatial_index.clear()
+            self._oaza_aza_map.clear()
+            return
+        self._attribute_index.pop(layer_id, None)
+        self._spatial_index.pop(layer_id, None)
+        self._oaza_aza_map.pop(layer_id, None)
+
+    def _index_for(self, layer: QgsVectorLayer) -> Optional[Dict]:
+        """Return the oaza -> aza -> chiban -> [fid] index for a layer.
+
+        None when the layer lacks one of the 大字名/字名/地番 fields; callers
+        then fall back to an expression request.
+        """
+        lid = layer.id()
+        if lid in self._attribute_index:
+            return self._attribute_index[lid]
+
+        fields = layer.fields()
+        indices = [fields.indexOf(name)
+                   for name in (OAZA_FIELD, AZA_FIELD, CHIBAN_FIELD)]
+        if min(indices) < 0:
+            self._attribute_index[lid] = None
+            return None
+        oaza_idx, aza_idx, chiban_idx = indices
+
+        request = QgsFeatureRequest()
+        request.setFlags(QgsFeatureRequest.NoGeometry)
+        request.setSubsetOfAttributes(indices)
+        index: Dict[str, Dict[str, Dict[str, List[int]]]] = {}
+        for feat in layer.getFeatures(request):
+            attrs = feat.attributes()
+            oaza = self._key(attrs[oaza_idx])
+            aza = self._key(attrs[aza_idx])
+            chiban = self._key(attrs[chiban_idx])
+            (index.setdefault(oaza, {})
+                  .setdefault(aza, {})
+                  .setdefault(chiban, [])
+                  .append(feat.id()))
+        self._attribute_index[lid] = index
+        self._log(f'属性インデックス作成: {layer.name()} ({len(index)} 大字)')
+        return index
+
+    def _spatial_index_for(self,
+                           layer: QgsVectorLayer) -> Optional[QgsSpatialIndex]:
+        """Return an in-memory spatial index, or None to use filterRect.
+
+        Only sources that report SpatialIndexNotPresent get one; providers
+        that answer SpatialIndexUnknown (PostGIS, WFS, ...) filter
+        server-side and would otherwise load every geometry here.
+        """
+        lid = layer.id()
+        if lid in self._spatial_index:
+            return self._spatial_index[lid]
+        if layer.hasSpatialIndex() != QgsFeatureSource.SpatialIndexNotPresent:
+            return None
+        request = QgsFeatureRequest().setNoAttributes()
+        spatial_index = QgsSpatialIndex(layer.getFeatures(request))
+        self._spatial_index[lid] = spatial_index
+        return spatial_index
+
+    @staticmethod
+    def _features_by_ids(layer: QgsVectorLayer,
+                         fids: List[int]) -> List[QgsFeature]:
+        if not fids:
+            return []
+        return list(layer.getFeatures(QgsFeatureRequest().setFilterFids(fids)))
 
     # ------------------------------------------------------------------
     # Internal
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def _key(value) -> str:
+        """Attribute value as an index key (NULL -> '')."""
+        if value is None or value == NULL:
+            return ''
+        return str(value)
+
     @staticmethod
     def _escape(val: str) -> str:
         return val.replace("'", "''")
@@ -70,6 +70,9 @@ class JapanLandSurveyAssistant:
             QgsApplication.processingRegistry().removeProvider(self.provider)
             self.provider = None
 
+        from .services.plugin_bridge import PluginBridge
+        PluginBridge.disconnect_signals()
+
     def run(self):
         from .ui.main_dialog import MainDialog
         if self.main_dialog is None:
@@ -7,7 +7,7 @@ from qgis.core import (
     QgsProcessingContext, QgsProcessingFeedback, QgsProject,
 )
 
-from ...core.kokudo_api_client import KOKUDO_DATASETS
+from ...core.kokudo_datasets import KOKUDO_DATASETS
 
 
 class LoadKokudoAlgorithm(QgsProcessingAlgorithm):
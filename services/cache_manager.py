@@ -4,6 +4,7 @@
 import os
 import json
 import shutil
+import threading
 from typing import Optional, Dict
 
 
@@ -26,6 +27,7 @@ class CacheManager:
                 self.base_dir = os.path.join(str(Path.home()), '.cache', self.CACHE_DIR_NAME)
 
         self._index: Dict = {}
+        self._lock = threading.Lock()  # register() is called from worker threads
         self._load_index()
 
     def _load_index(self):
@@ -58,9 +60,57 @@ class CacheManager:
                 return path
         return None
 
+    def get_entry(self, key: str) -> Optional[Dict]:
+        """Return the index entry (path + metadata) for a key, if any."""
+        return self._index.get(key)
+
     def register(self, key: str, file_path: str, **metadata):
-        self._index[key] = {**metadata, 'path': file_path}
-        self._save_index()
+        with self._lock:
+            self._index[key] = {**metadata, 'path': file_path}
+            self._save_index()
+
+    def keys(self, prefix: str = ''):
+        """Return the registered cache keys, optionally filtered by prefix."""
+        return [k for k in list(self._index) if k.startswith(prefix)]
+
+    # SQLite (GeoPackage) sidecar files written next to the database
+    _SIDECAR_SUFFIXES = ('-wal', '-shm', '-journal')
+
+    def remove(self, key: str) -> bool:
+        """Delete a cached file and its index entry. Returns True if found.
+
+        The files are deleted first; if that raises (e.g. the GeoPackage is
+        still open on Windows) the entry is kept so the index matches disk.
+        """
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                return False
+            path = entry.get('path')
+            if path:
+                self._delete_path(path)
+            del self._index[key]
+            self._save_index()
+        return True
+
+    @classmethod
+    def _delete_path(cls, path: str):
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        elif os.path.exists(path):
+            os.remove(path)
+        for suffix in cls._SIDECAR_SUFFIXES:
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+    def paths(self, prefix: str = ''):
+        """Return existing cached paths whose key starts with prefix."""
+        result = []
+        for key in self.keys(prefix):
+            path = (self._index.get(key) or {}).get('path')
+            if path and os.path.exists(path):
+                result.append(path)
+        return result
 
     def clear_all(self):
         try:
@@ -1,6 +1,10 @@
 # -*- coding: utf-8 -*-
 """Integrated data loader service — delegates to plugins or built-in fallbacks."""
 
+import threading
+from concurrent.futures import Future
+from typing import Optional
+
 from qgis.core import QgsMessageLog, Qgis
 
 from .plugin_bridge import PluginBridge
@@ -10,9 +14,16 @@ from .cache_manager import CacheManager
 class DataLoaderService:
     """Unified interface for loading various data sources."""
 
+    # 実行中のダウンロード (パネル毎にサービスが作られるためクラスで共有)
+    _inflight = {}
+    _inflight_lock = threading.Lock()
+
     def __init__(self):
         self.bridge = PluginBridge()
         self.cache = CacheManager()
+        self._moj_loader = None
+        self._moj_downloader = None
+        self._configure_gdal_http()
 
     @staticmethod
     def _log(msg, level=Qgis.Info):
@@ -34,9 +45,10 @@ class DataLoaderService:
             )
         else:
             self._log('Loading MOJ XML via built-in parser')
-            from ..core.moj_xml_loader import MojXmlLoader
-            loader = MojXmlLoader()
-            return loader.load(
+            if self._moj_loader is None:
+                from ..core.moj_xml_loader import MojXmlLoader
+                self._moj_loader = MojXmlLoader()
+            return self._moj_loader.load(
                 file_path,
                 include_arbitrary=include_arbitrary,
                 include_outside=include_outside,
@@ -49,7 +61,8 @@ class DataLoaderService:
 
     def load_kokudo_data_paths(self, dataset_id: str, pref_codes: list,
                                fiscal_year: str = '',
-                               progress_callback=None):
+                               progress_callback=None,
+                               stop_check=None):
         """Download Kokudo data and return (dir, dataset_id, pref) tuples.
 
         Thread-safe: does not create QgsVectorLayer objects.
@@ -60,8 +73,48 @@ class DataLoaderService:
             dataset_id, pref_codes, fiscal_year,
             cache_manager=self.cache,
             progress_callback=progress_callback,
+            stop_check=stop_check,
         )
 
+    def _get_moj_downloader(self):
+        """登記所備付地図ダウンローダー（遅延生成し、サービス内で共有）."""
+        if self._moj_downloader is None:
+            from ..core.moj_geojson_downloader import MojGeoJsonDownloader
+            self._moj_downloader = MojGeoJsonDownloader(
+                cache_dir=self.cache.base_dir)
+        return self._moj_downloader
+
+    def find_cached_moj(self, city_code: str,
+                        preferred_year: str = '') -> Optional[str]:
+        """有効期限内の登記所備付地図キャッシュのパス（無ければ None）."""
+        return self._get_moj_downloader().find_cached(
+            city_code, preferred_year, self.cache)
+
+    def moj_cache_paths(self, city_code: str):
+        """市区町村の登記所備付地図キャッシュのファイルパス一覧."""
+        return self._get_moj_downloader().cached_paths(city_code, self.cache)
+
+    def clear_moj_cache(self, city_code: str) -> bool:
+        """市区町村の登記所備付地図キャッシュを削除（削除があれば True）."""
+        return self._get_moj_downloader().clear_cached(city_code, self.cache)
+
+    def clear_kokudo_cache(self, dataset_id: str) -> bool:
+        """データセットのダウンロード済みキャッシュを削除.
+
+        Returns:
+            削除した場合 True（キャッシュが無ければ False）
+        """
+        import os
+        import shutil
+        from ..core.kokudo_api_client import KokudoApiClient
+        cache_dir = os.path.join(self.cache.get_download_dir(),
+                                 KokudoApiClient.CACHE_SUBDIR, dataset_id)
+        if not os.path.isdir(cache_dir):
+            return False
+        shutil.rmtree(cache_dir)
+        self._log(f'国土数値情報キャッシュ削除: {cache_dir}')
+        return True
+
     def load_kokudo_data(self, dataset_id: str, pref_codes: list,
                          fiscal_year: str = '',
                          progress_callback=None):
@@ -89,24 +142,25 @@ class DataLoaderService:
     # ------------------------------------------------------------------
 
     def load_moj_from_extent(self, lat: float, lon: float,
-                             preferred_year: str = ''):
+                             preferred_year: str = '',
+                             stop_check=None):
         """マップ中心座標から登記所備付地図GeoJSONを自動取得.
 
         Args:
             lat: 緯度 (EPSG:4326)
             lon: 経度 (EPSG:4326)
             preferred_year: 希望年度 (空文字で最新)
+            stop_check: 中断要求を返す callable
 
         Returns:
             QgsVectorLayer or None
         """
-        from ..core.moj_geojson_downloader import MojGeoJsonDownloader
         self._log(f'登記所備付地図 自動取得: lat={lat}, lon={lon}, year={preferred_year}')
-        downloader = MojGeoJsonDownloader()
-        return downloader.fetch_and_load(
+        return self._get_moj_downloader().fetch_and_load(
             lat, lon,
             preferred_year=preferred_year,
             cache_manager=self.cache,
+            stop_check=stop_check,
         )
 
     # ------------------------------------------------------------------
@@ -117,6 +171,25 @@ class DataLoaderService:
         'https://habs.rad.naro.go.jp/spatial_data/fudepoly47'
     )
 
+    # /vsicurl/ 用 GDAL 設定: 初回 open でヘッダ + R-tree 上位を1回で取得し、
+    # CDN の一時的なエラーはリトライで吸収する
+    GDAL_HTTP_OPTIONS = {
+        'GDAL_INGESTED_BYTES_AT_OPEN': '65536',
+        'GDAL_HTTP_MAX_RETRY': '3',
+        'GDAL_HTTP_RETRY_DELAY': '1',
+    }
+
+    @classmethod
+    def _configure_gdal_http(cls):
+        """GDAL の HTTP 設定を適用（ユーザー設定済みの値は上書きしない）."""
+        try:
+            from osgeo import gdal
+        except ImportError:
+            return
+        for key, value in cls.GDAL_HTTP_OPTIONS.items():
+            if gdal.GetConfigOption(key) is None:
+                gdal.SetConfigOption(key, value)
+
     def load_fude_polygon_layer(self, pref_code: str):
         """農研機構 筆ポリゴン FlatGeobuf をオンラインで読込.
 
@@ -154,6 +227,21 @@ class DataLoaderService:
     # 行政区域データ直接ダウンロード（API廃止対応）
     # ------------------------------------------------------------------
 
+    N03_CANDIDATE_YEARS = ('2025', '2024', '2023', '2022')
+    N03_URL_TEMPLATE = (
+        'https://nlftp.mlit.go.jp/ksj/gml/data/N03/N03-{year}/'
+        'N03-{year}0101_{pref}_GML.zip'
+    )
+
+    @classmethod
+    def _n03_candidate_urls(cls, pref_code: str):
+        """(year, url) の候補を最新年度から順に返す."""
+        template = cls.N03_URL_TEMPLATE
+        return tuple(
+            (year, template.format(year=year, pref=pref_code))
+            for year in cls.N03_CANDIDATE_YEARS
+        )
+
     def download_admin_boundary(self, pref_code: str):
         """国土数値情報 行政区域(N03) を直接ダウンロードして読込.
 
@@ -163,77 +251,274 @@ class DataLoaderService:
         Returns:
             QgsVectorLayer or None
         """
+        extract_dir = self._fetch_admin_boundary_dir(pref_code)
+        if not extract_dir:
+            return None
+        return self._load_shp_from_dir(extract_dir, f'行政区域_{pref_code}')
+
+    def _fetch_admin_boundary_dir(self, pref_code: str,
+                                  progress_callback=None, stop_check=None):
+        """行政区域 ZIP の取得・展開（同一都道府県の同時要求は1回に集約）."""
+        return self._coalesce(
+            f'admin_N03_{pref_code}',
+            self._fetch_admin_boundary_dir_once, pref_code,
+            progress_callback, stop_check,
+        )
+
+    def _fetch_admin_boundary_dir_once(self, pref_code: str,
+                                       progress_callback=None,
+                                       stop_check=None):
+        """行政区域 ZIP を取得・展開し、展開先ディレクトリを返す.
+
+        キャッシュ済みの場合は ETag / Last-Modified による条件付き GET で
+        再検証し、304 ならそのまま再利用、200 なら再展開する。
+
+        Returns:
+            展開先ディレクトリ or None
+        """
         import os
-        import zipfile
-        from urllib.request import urlopen, Request
-        from qgis.core import QgsVectorLayer
 
-        # キャッシュ確認
         cache_key = f'admin_N03_{pref_code}'
+        download_dir = self.cache.get_download_dir()
+        zip_path = os.path.join(download_dir, f'N03_{pref_code}.zip')
+        extract_dir = os.path.join(download_dir, f'N03_{pref_code}')
+
+        # キャッシュ確認（条件付き GET で再検証）
         cached = self.cache.get_cached_file(cache_key)
         if cached:
-            self._log(f'行政区域キャッシュ使用: {cached}')
-            return self._load_shp_from_dir(cached, f'行政区域_{pref_code}')
-
-        # 直接ダウンロード URL（最新年度から順に試行）
-        years = ['2025', '2024', '2023', '2022']
-        dl_url = None
-        for year in years:
-            url = (
-                f'https://nlftp.mlit.go.jp/ksj/gml/data/N03/N03-{year}/'
-                f'N03-{year}0101_{pref_code}_GML.zip'
-            )
+            entry = self.cache.get_entry(cache_key) or {}
+            dl_url = entry.get('url')
+            if not dl_url:
+                self._log(f'行政区域キャッシュ使用: {cached}')
+                return cached
+            try:
+                validators = self._download_zip(
+                    dl_url, zip_path,
+                    etag=entry.get('etag', ''),
+                    last_modified=entry.get('last_modified', ''),
+                    progress_callback=progress_callback,
+                    stop_check=stop_check,
+                )
+            except InterruptedError:
+                raise
+            except Exception as e:
+                self._log(f'行政区域 再検証失敗（キャッシュ使用）: {e}',
+                          Qgis.Warning)
+                return cached
+            if validators is None:
+                self._log(f'行政区域キャッシュ使用 (304): {cached}')
+                return cached
+            self._log(f'行政区域 更新を検出、再展開: {dl_url}')
+            extract_dir = cached
+        else:
+            dl_url = self._find_admin_boundary_url(pref_code)
+            if not dl_url:
+                self._log('行政区域 ダウンロード URL が見つかりません',
+                          Qgis.Warning)
+                return None
+            validators = self._download_zip(
+                dl_url, zip_path, progress_callback=progress_callback,
+                stop_check=stop_check)
+
+        # 展開
+        self._extract_zip_atomic(zip_path, extract_dir)
+
+        # キャッシュ登録（再検証用に URL と検証子も保存）
+        etag, last_modified = validators
+        self.cache.register(cache_key, extract_dir,
+                            dataset='N03', pref=pref_code, url=dl_url,
+                            etag=etag, last_modified=last_modified)
+        return extract_dir
+
+    def _find_admin_boundary_url(self, pref_code: str):
+        """直接ダウンロード URL を最新年度から順に HEAD で探す."""
+        from urllib.request import urlopen, Request
+
+        for _year, url in self._n03_candidate_urls(pref_code):
             self._log(f'行政区域 URL 試行: {url}')
             try:
                 req = Request(url, method='HEAD',
                               headers={'User-Agent': 'JLSA-QGISPlugin/1.0'})
                 with urlopen(req, timeout=15) as resp:
                     if resp.status == 200:
-                        dl_url = url
                         self._log(f'行政区域 URL 発見: {url}')
-                        break
+                        return url
             except Exception:
                 continue
+        return None
 
-        if not dl_url:
-            self._log('行政区域 ダウンロード URL が見つかりません', Qgis.Warning)
-            return None
+    # Range 分割ダウンロード: この大きさ以上で、サーバが bytes を受け付ける場合
+    RANGE_MIN_BYTES = 8 * 1024 * 1024
+    RANGE_PARTS = 4
 
-        # ダウンロード
-        download_dir = self.cache.get_download_dir()
-        zip_path = os.path.join(download_dir, f'N03_{pref_code}.zip')
-        self._log(f'行政区域 ダウンロード開始: {dl_url}')
-        req = Request(dl_url, headers={'User-Agent': 'JLSA-QGISPlugin/1.0'})
-        with urlopen(req, timeout=120) as resp:
-            with open(zip_path, 'wb') as f:
-                while True:
-                    chunk = resp.read(8192)
-                    if not chunk:
-                        break
-                    f.write(chunk)
+    def _download_zip(self, url: str, zip_path: str,
+                      etag: str = '', last_modified: str = '',
+                      progress_callback=None, allow_ranges: bool = True,
+                      stop_check=None):
+        """ZIP をダウンロード（検証子があれば条件付き GET）.
+
+        大きなファイルは Range 要求で分割し並列に取得する。
+        progress_callback があれば (受信バイト数, 全体バイト数 or 0) を通知。
+        stop_check が True を返すと途中のファイルを削除し InterruptedError。
+
+        Returns:
+            (etag, last_modified) タプル。304 Not Modified の場合は None
+        """
+        import os
+        from urllib.error import HTTPError
+        from urllib.request import urlopen, Request
+
+        headers = {'User-Agent': 'JLSA-QGISPlugin/1.0'}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+        self._log(f'行政区域 ダウンロード開始: {url}')
+        req = Request(url, headers=headers)
+        try:
+            resp = urlopen(req, timeout=120)
+        except HTTPError as e:
+            if e.code == 304:
+                return None
+            raise
+        with resp:
+            validators = (resp.headers.get('ETag', '') or '',
+                          resp.headers.get('Last-Modified', '') or '')
+            total = int(resp.headers.get('Content-Length') or 0)
+            ranged = (allow_ranges and total >= self.RANGE_MIN_BYTES
+                      and resp.headers.get('Accept-Ranges', '').lower()
+                      == 'bytes')
+            retry = False
+            if ranged:
+                try:
+                    self._download_ranges(url, resp, zip_path, total,
+                                          validators[0], progress_callback,
+                                          stop_check)
+                except InterruptedError:
+                    os.remove(zip_path)
+                    raise
+                except OSError as e:
+                    self._log(f'分割ダウンロード失敗、通常取得に切替: {e}',
+                              Qgis.Warning)
+                    retry = True
+            else:
+                downloaded = 0
+                with open(zip_path, 'wb') as f:
+                    while True:
+                        if stop_check and stop_check():
+                            break
+                        chunk = resp.read(65536)
+                        if not chunk:
+                            break
+                        f.write(chunk)
+                        downloaded += len(chunk)
+                        if progress_callback:
+                            progress_callback(downloaded, total)
+                if stop_check and stop_check():
+                    os.remove(zip_path)
+                    raise InterruptedError(f'ダウンロード中断: {url}')
+        if retry:
+            # 先頭区間の応答は途中まで読まれているので、通常の GET で取り直す
+            return self._download_zip(url, zip_path,
+                                      progress_callback=progress_callback,
+                                      allow_ranges=False,
+                                      stop_check=stop_check)
         self._log(f'行政区域 ダウンロード完了: {zip_path}')
+        return validators
 
-        # 展開
-        extract_dir = os.path.join(download_dir, f'N03_{pref_code}')
-        os.makedirs(extract_dir, exist_ok=True)
-        with zipfile.ZipFile(zip_path, 'r') as zf:
-            zf.extractall(extract_dir)
+    def _download_ranges(self, url: str, first_resp, path: str, total: int,
+                         etag: str = '', progress_callback=None,
+                         stop_check=None):
+        """total バイトを RANGE_PARTS 個に分けて並列取得し path の各位置に書く.
 
-        # キャッシュ登録
-        self.cache.register(cache_key, extract_dir,
-                            dataset='N03', pref=pref_code)
+        先頭区間は既に開いている first_resp から読むので、追加の要求は
+        RANGE_PARTS - 1 本。If-Range で途中更新されたファイルの混在を防ぐ。
+        """
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        from urllib.request import urlopen, Request
 
-        return self._load_shp_from_dir(extract_dir, f'行政区域_{pref_code}')
+        part = -(-total // self.RANGE_PARTS)
+        bounds = [(start, min(total, start + part) - 1)
+                  for start in range(0, total, part)]
+        with open(path, 'wb') as f:
+            f.truncate(total)
+
+        lock = threading.Lock()
+        received = [0]
+
+        def fetch(index, start, end):
+            if index == 0:
+                resp = first_resp
+            else:
+                headers = {'User-Agent': 'JLSA-QGISPlugin/1.0',
+                           'Range': f'bytes={start}-{end}'}
+                if etag:
+                    headers['If-Range'] = etag
+                resp = urlopen(Request(url, headers=headers), timeout=120)
+                if resp.status != 206:
+                    resp.close()
+                    raise OSError(f'Range 非対応の応答: HTTP {resp.status}')
+            try:
+                remaining = end - start + 1
+                with open(path, 'r+b') as f:
+                    f.seek(start)
+                    while remaining:
+                        if stop_check and stop_check():
+                            raise InterruptedError(f'ダウンロード中断: {url}')
+                        chunk = resp.read(min(65536, remaining))
+                        if not chunk:
+                            raise OSError(f'受信が途中で終了: {start}-{end}')
+                        f.write(chunk)
+                        remaining -= len(chunk)
+                        if progress_callback:
+                            with lock:
+                                received[0] += len(chunk)
+                                done = received[0]
+                            progress_callback(done, total)
+            finally:
+                if index != 0:
+                    resp.close()
+
+        with ThreadPoolExecutor(max_workers=len(bounds)) as pool:
+            futures = [pool.submit(fetch, i, start, end)
+                       for i, (start, end) in enumerate(bounds)]
+            for fut in as_completed(futures):
+                fut.result()
+
+    @staticmethod
+    def _extract_zip_atomic(zip_path: str, extract_dir: str):
+        """ZIP を一時ディレクトリに展開してから差し替える.
+
+        旧版のファイルが残らず、展開途中の状態も見えない。
+        """
+        import os
+        import shutil
+        import zipfile
+
+        tmp_dir = extract_dir + '.new'
+        old_dir = extract_dir + '.old'
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        with zipfile.ZipFile(zip_path, 'r') as zf:
+            zf.extractall(tmp_dir)
+
+        if os.path.isdir(extract_dir):
+            shutil.rmtree(old_dir, ignore_errors=True)
+            os.rename(extract_dir, old_dir)
+        os.rename(tmp_dir, extract_dir)
+        shutil.rmtree(old_dir, ignore_errors=True)
 
     @staticmethod
     def _load_shp_from_dir(directory, name):
         """ディレクトリ内の最初の .shp を読込."""
         import os
         from qgis.core import QgsVectorLayer
+        sep = os.sep
         for root, _dirs, files in os.walk(directory):
             for fn in files:
                 if fn.lower().endswith('.shp'):
-                    shp_path = os.path.join(root, fn)
+                    shp_path = f'{root}{sep}{fn}'
                     layer = QgsVectorLayer(shp_path, name, 'ogr')
                     if layer.isValid():
                         return layer
@@ -243,88 +528,59 @@ class DataLoaderService:
     def _find_shp_in_dir(directory):
         """ディレクトリ内の最初の .shp パスを返す (レイヤ作成なし)."""
         import os
+        sep = os.sep
         for root, _dirs, files in os.walk(directory):
             for fn in files:
                 if fn.lower().endswith('.shp'):
-                    return os.path.join(root, fn)
+                    return f'{root}{sep}{fn}'
         return None
 
-    def download_admin_boundary_path(self, pref_code: str):
+    def download_admin_boundary_path(self, pref_code: str,
+                                     progress_callback=None,
+                                     stop_check=None):
         """行政区域データをダウンロードし、shpパスとレイヤ名を返す.
 
         ワーカースレッドから安全に呼べる (QgsVectorLayerを作成しない)。
+        progress_callback は (受信バイト数, 全体バイト数 or 0) を受け取る。
+        stop_check が True を返すと InterruptedError で中断する。
 
         Returns:
             (shp_path, layer_name) or (None, None)
         """
-        import os
-        import zipfile
-        from urllib.request import urlopen, Request
-
-        layer_name = f'行政区域_{pref_code}'
-
-        # キャッシュ確認
-        cache_key = f'admin_N03_{pref_code}'
-        cached = self.cache.get_cached_file(cache_key)
-        if cached:
-            self._log(f'行政区域キャッシュ使用: {cached}')
-            shp = self._find_shp_in_dir(cached)
-            return (shp, layer_name) if shp else (None, None)
-
-        # 直接ダウンロード URL（最新年度から順に試行）
-        years = ['2025', '2024', '2023', '2022']
-        dl_url = None
-        for year in years:
-            url = (
-                f'https://nlftp.mlit.go.jp/ksj/gml/data/N03/N03-{year}/'
-                f'N03-{year}0101_{pref_code}_GML.zip'
-            )
-            self._log(f'行政区域 URL 試行: {url}')
-            try:
-                req = Request(url, method='HEAD',
-                              headers={'User-Agent': 'JLSA-QGISPlugin/1.0'})
-                with urlopen(req, timeout=15) as resp:
-                    if resp.status == 200:
-                        dl_url = url
-                        self._log(f'行政区域 URL 発見: {url}')
-                        break
-            except Exception:
-                continue
-
-        if not dl_url:
-            self._log('行政区域 ダウンロード URL が見つかりません', Qgis.Warning)
+        extract_dir = self._fetch_admin_boundary_dir(
+            pref_code, progress_callback, stop_check)
+        if not extract_dir:
             return None, None
-
-        # ダウンロード
-        download_dir = self.cache.get_download_dir()
-        zip_path = os.path.join(download_dir, f'N03_{pref_code}.zip')
-        self._log(f'行政区域 ダウンロード開始: {dl_url}')
-        req = Request(dl_url, headers={'User-Agent': 'JLSA-QGISPlugin/1.0'})
-        with urlopen(req, timeout=120) as resp:
-            with open(zip_path, 'wb') as f:
-                while True:
-                    chunk = resp.read(8192)
-                    if not chunk:
-                        break
-                    f.write(chunk)
-        self._log(f'行政区域 ダウンロード完了: {zip_path}')
-
-        # 展開
-        extract_dir = os.path.join(download_dir, f'N03_{pref_code}')
-        os.makedirs(extract_dir, exist_ok=True)
-        with zipfile.ZipFile(zip_path, 'r') as zf:
-            zf.extractall(extract_dir)
-
-        # キャッシュ登録
-        self.cache.register(cache_key, extract_dir,
-                            dataset='N03', pref=pref_code)
-
         shp = self._find_shp_in_dir(extract_dir)
-        return (shp, layer_name) if shp else (None, None)
+        return (shp, f'行政区域_{pref_code}') if shp else (None, None)
 
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
 
+    def _coalesce(self, key: str, func, *args):
+        """同じ key の処理が実行中なら、その結果を待って共有する."""
+        with self._inflight_lock:
+            fut = self._inflight.get(key)
+            owner = fut is None
+            if owner:
+                fut = Future()
+                self._inflight[key] = fut
+        if not owner:
+            self._log(f'実行中の処理を待機: {key}')
+            return fut.result()
+
+        try:
+            result = func(*args)
+        except Exception as e:
+            fut.set_exception(e)
+            raise
+        else:
+            fut.set_result(result)
+            return result
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
     def get_plugin_status(self) -> dict:
         return self.bridge.get_status_all()
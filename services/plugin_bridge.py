@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 """Plugin bridge for detecting and calling existing QGIS plugins."""
 
+import time
+
 from qgis.core import QgsMessageLog, Qgis
 
 
@@ -22,37 +24,76 @@ class PluginBridge:
             'provider_id': 'quickdem4jp',
         },
     }
+    _STATUS_ITEMS = tuple(
+        (pid, info['name']) for pid, info in SUPPORTED_PLUGINS.items()
+    )
+
+    # Fallback lifetime (seconds) for cached availability; QGIS exposes no
+    # per-plugin load/unload signal to Python, so entries also expire.
+    STATUS_TTL = 30.0
+
+    # Shared by all instances, so the QGIS signal is connected once per
+    # class rather than once per bridge (bound slots kept instances alive).
+    _status_cache = {}  # plugin_id -> (available, checked_at)
+    _signals_connected = False
 
     def __init__(self):
-        self._status_cache = {}
+        self._connect_signals()
+
+    @classmethod
+    def _connect_signals(cls):
+        """Invalidate the cache once QGIS has finished loading plugins."""
+        if cls._signals_connected:
+            return
+        try:
+            from qgis.utils import iface
+            iface.initializationCompleted.connect(cls._clear_status_cache)
+            cls._signals_connected = True
+        except Exception:
+            pass
+
+    @classmethod
+    def disconnect_signals(cls):
+        """Undo _connect_signals (called when the plugin is unloaded)."""
+        if not cls._signals_connected:
+            return
+        try:
+            from qgis.utils import iface
+            iface.initializationCompleted.disconnect(cls._clear_status_cache)
+        except Exception:
+            pass
+        cls._signals_connected = False
+
+    @classmethod
+    def _clear_status_cache(cls):
+        cls._status_cache.clear()
 
     @staticmethod
     def _log(message: str, level=Qgis.Info):
         QgsMessageLog.logMessage(message, 'JLSA-Bridge', level)
 
     def is_plugin_available(self, plugin_id: str) -> bool:
-        if plugin_id in self._status_cache:
-            return self._status_cache[plugin_id]
+        now = time.monotonic()
+        cached = self._status_cache.get(plugin_id)
+        if cached is not None and now - cached[1] < self.STATUS_TTL:
+            return cached[0]
         try:
             from qgis.utils import plugins
             available = plugin_id in plugins
         except Exception:
             available = False
-        self._status_cache[plugin_id] = available
+        self._status_cache[plugin_id] = (available, now)
         return available
 
     def refresh(self):
-        self._status_cache.clear()
+        self._clear_status_cache()
 
     def get_status_all(self) -> dict:
         self.refresh()
-        result = {}
-        for pid, info in self.SUPPORTED_PLUGINS.items():
-            result[pid] = {
-                'name': info['name'],
-                'available': self.is_plugin_available(pid),
-            }
-        return result
+        return {
+            pid: {'name': name, 'available': self.is_plugin_available(pid)}
+            for pid, name in self._STATUS_ITEMS
+        }
 
     def is_mojxml_loader_available(self) -> bool:
         return self.is_plugin_available('mojxml_plugin')
@@ -1,26 +1,28 @@
 # -*- coding: utf-8 -*-
 """データ取得タブ — MOJ XML / 国土数値情報 / 登記所備付地図自動取得 / PMTiles."""
 
+import functools
 import os
+import threading
 
 from qgis.PyQt.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGroupBox, QRadioButton,
     QLabel, QLineEdit, QPushButton, QComboBox, QCheckBox,
-    QFileDialog, QMessageBox, QProgressBar, QListWidget,
-    QAbstractItemView, QApplication,
+    QFileDialog, QMessageBox, QProgressBar, QListWidget, QListWidgetItem,
+    QAbstractItemView,
 )
 from qgis.PyQt.QtCore import Qt, QThread, pyqtSignal
-from qgis.PyQt.QtGui import QCursor
 from qgis.core import (
     QgsProject, QgsCoordinateReferenceSystem, QgsCoordinateTransform,
     QgsVectorLayer, QgsVectorSimplifyMethod, QgsMessageLog, Qgis,
+    QgsApplication, QgsTask, QgsFeatureSource,
 )
 
 from ..services.data_loader_service import DataLoaderService
 from ..services.plugin_bridge import PluginBridge
-from ..core.kokudo_api_client import KOKUDO_DATASETS
 from ..core.config import Config
-from ..core.crs_utils import canvas_center_to_4326
+from ..core.kokudo_datasets import KOKUDO_DATASETS
+from ..core.crs_utils import in_japan
 
 
 # Prefecture master (code → name)
@@ -38,6 +40,88 @@ PREFECTURES = {
     '41': '佐賀県', '42': '長崎県', '43': '熊本県', '44': '大分県',
     '45': '宮崎県', '46': '鹿児島県', '47': '沖縄県',
 }
+PREFECTURES_BY_NAME = {name: code for code, name in PREFECTURES.items()}
+
+
+@functools.lru_cache(maxsize=256)
+def _resolve_pref_code_cached(lat: float, lon: float) -> str:
+    """複数の逆ジオコーダーで都道府県コードを取得（フォールバック付き）.
+
+    判定できない場合は LookupError を送出する（失敗結果はキャッシュしない）。
+    """
+    # 1. GSI 逆ジオコーダー
+    try:
+        from ..core.moj_geojson_downloader import MojGeoJsonDownloader
+        downloader = MojGeoJsonDownloader()
+        city_code = downloader.resolve_city_code(lat, lon)
+        if city_code and len(city_code) >= 2:
+            return city_code[:2]
+    except Exception as e:
+        QgsMessageLog.logMessage(
+            f'GSI逆ジオコーダー失敗: {e}', 'JLSA-Loader', Qgis.Warning)
+
+    # 2. HeartRails Geo API (フォールバック)
+    try:
+        from ..core.geocoder import Geocoder
+        geo = Geocoder()
+        results = geo.reverse_geocode(lon, lat)
+        if results:
+            pref_name = results[0].get('prefecture', '')
+            if pref_name:
+                # 都道府県名 → コード逆引き
+                code = PREFECTURES_BY_NAME.get(pref_name)
+                if code:
+                    QgsMessageLog.logMessage(
+                        f'HeartRails検出: {pref_name} ({code})',
+                        'JLSA-Loader', Qgis.Info)
+                    return code
+    except Exception as e:
+        QgsMessageLog.logMessage(
+            f'HeartRails逆ジオコーダー失敗: {e}',
+            'JLSA-Loader', Qgis.Warning)
+
+    raise LookupError(f'都道府県を判定できません: lat={lat}, lon={lon}')
+
+
+def _prepare_kokudo_sources(task, results):
+    """QgsTask 本体: 展開ディレクトリから読込対象ファイルを特定する.
+
+    空間インデックスもここで作成する。レイヤは返さず
+    (path, layer_name) のリストを返す。中止時は None。
+    """
+    from ..core.kokudo_api_client import KokudoApiClient
+    sources = []
+    total = len(results)
+    for i, (extract_dir, dataset_id, pref_code) in enumerate(results):
+        if task.isCanceled():
+            return None
+        source = KokudoApiClient.prepare_layer_source(
+            extract_dir, dataset_id, pref_code)
+        if source:
+            sources.append(source)
+        task.setProgress((i + 1) * 100.0 / total)
+    return sources
+
+
+class _PrefDetectThread(QThread):
+    """Background thread for 逆ジオコーダーによる都道府県判定."""
+    status = pyqtSignal(str)
+    done = pyqtSignal(str)  # pref_code ('' = 判定不可)
+
+    def __init__(self, lat, lon):
+        super().__init__()
+        self.lat = lat
+        self.lon = lon
+
+    def run(self):
+        self.status.emit(
+            f'逆ジオコーダーに問い合わせ中... ({self.lat:.4f}, {self.lon:.4f})')
+        try:
+            pref_code = _resolve_pref_code_cached(
+                round(self.lat, 3), round(self.lon, 3))
+        except Exception:
+            pref_code = ''
+        self.done.emit(pref_code)
 
 
 class _KokudoDownloadThread(QThread):
@@ -46,7 +130,7 @@ class _KokudoDownloadThread(QThread):
     QgsVectorLayer はスレッドアフィニティがあるため、
     ファイルパス情報のみを返し、メインスレッドでレイヤを作成する。
     """
-    progress = pyqtSignal(int, int)
+    progress = pyqtSignal(int, int)  # KB 単位 (int32 に収めるため)
     finished_ok = pyqtSignal(list)  # list of (extract_dir, dataset_id, pref)
     error = pyqtSignal(str)
 
@@ -56,16 +140,24 @@ class _KokudoDownloadThread(QThread):
         self.dataset_id = dataset_id
         self.pref_codes = pref_codes
         self.fiscal_year = fiscal_year
+        self._stop = threading.Event()
 
     def run(self):
         try:
             results = self.service.load_kokudo_data_paths(
                 self.dataset_id, self.pref_codes, self.fiscal_year,
-                progress_callback=lambda c, t: self.progress.emit(c, t),
+                progress_callback=lambda c, t: self.progress.emit(
+                    c // 1024, t // 1024),
+                stop_check=self._stop.is_set,
             )
+            if self._stop.is_set():
+                return
             self.finished_ok.emit(results or [])
+        except InterruptedError:
+            pass
         except Exception as e:
-            self.error.emit(str(e))
+            if not self._stop.is_set():
+                self.error.emit(str(e))
 
 
 class _MojAutoDownloadThread(QThread):
@@ -83,17 +175,55 @@ class _MojAutoDownloadThread(QThread):
         self.lat = lat
         self.lon = lon
         self.preferred_year = preferred_year
+        self._stop = threading.Event()
 
     def run(self):
         try:
             layer = self.service.load_moj_from_extent(
                 self.lat, self.lon,
                 preferred_year=self.preferred_year,
+                stop_check=self._stop.is_set,
             )
-            if layer and layer.isValid():
+            if self._stop.is_set():
+                return
+            if layer:  # サービス側で isValid() 済み
                 self.finished_ok.emit(layer.source(), layer.name())
             else:
                 self.error.emit('レイヤの読込に失敗しました。')
+        except InterruptedError:
+            pass
+        except Exception as e:
+            if not self._stop.is_set():
+                self.error.emit(str(e))
+
+
+class _FudeDownloadThread(QThread):
+    """Background thread for 筆ポリゴン FlatGeobuf open.
+
+    /vsicurl/ の HTTP Range 読込を GUI スレッドから外す。
+    レイヤはメインスレッドで再作成するため、ソースとレイヤ名のみを返す。
+    """
+    finished_ok = pyqtSignal(str, str)  # source_path, layer_name
+    error = pyqtSignal(str)
+
+    def __init__(self, service, pref_code):
+        super().__init__()
+        self.service = service
+        self.pref_code = pref_code
+        self._stop = threading.Event()
+
+    def run(self):
+        try:
+            layer = self.service.load_fude_polygon_layer(self.pref_code)
+            if self._stop.is_set():
+                return
+            if layer:  # サービス側で isValid() 済み
+                self.finished_ok.emit(layer.source(), layer.name())
+            else:
+                self.error.emit(
+                    f'都道府県: {PREFECTURES.get(self.pref_code, "")} '
+                    f'({self.pref_code})'
+                )
         except Exception as e:
             self.error.emit(str(e))
 
@@ -107,6 +237,10 @@ class DataLoaderPanel(QWidget):
         self.service = DataLoaderService()
         self.config = Config()
         self._download_thread = None
+        self._layer_task = None
+        self._detect_thread = None
+        self._crs_4326 = QgsCoordinateReferenceSystem('EPSG:4326')
+        self._xform_cache = {}  # canvas CRS -> QgsCoordinateTransform
         self._setup_ui()
         self._update_plugin_status()
 
@@ -168,10 +302,7 @@ class DataLoaderPanel(QWidget):
 
         kokudo_layout.addWidget(QLabel('データセット:'))
         self.combo_dataset = QComboBox()
-        for code, info in KOKUDO_DATASETS.items():
-            self.combo_dataset.addItem(
-                f"[{info['category']}] {info['name']} ({code})", code
-            )
+        self._populate_datasets()
         kokudo_layout.addWidget(self.combo_dataset)
 
         pref_header = QHBoxLayout()
@@ -183,8 +314,14 @@ class DataLoaderPanel(QWidget):
         kokudo_layout.addLayout(pref_header)
         self.list_pref = QListWidget()
         self.list_pref.setSelectionMode(QAbstractItemView.MultiSelection)
+        self.list_pref.setUpdatesEnabled(False)
+        self._pref_index = {}  # pref_code -> QListWidgetItem
         for code, name in PREFECTURES.items():
-            self.list_pref.addItem(f'{name} ({code})')
+            item = QListWidgetItem(f'{name} ({code})')
+            item.setData(Qt.UserRole, code)
+            self.list_pref.addItem(item)
+            self._pref_index[code] = item
+        self.list_pref.setUpdatesEnabled(True)
         self.list_pref.setMaximumHeight(150)
         kokudo_layout.addWidget(self.list_pref)
 
@@ -195,6 +332,12 @@ class DataLoaderPanel(QWidget):
         self.edit_year.setMaximumWidth(100)
         yr_row.addWidget(self.edit_year)
         yr_row.addStretch()
+        self.btn_clear_kokudo_cache = QPushButton('キャッシュ削除')
+        self.btn_clear_kokudo_cache.setToolTip(
+            '選択中データセットのダウンロード済みファイルを削除し、'
+            '次回読込時に再取得します。')
+        self.btn_clear_kokudo_cache.clicked.connect(self._clear_kokudo_cache)
+        yr_row.addWidget(self.btn_clear_kokudo_cache)
         kokudo_layout.addLayout(yr_row)
 
         # ステータス表示
@@ -267,6 +410,21 @@ class DataLoaderPanel(QWidget):
     # Slots
     # ------------------------------------------------------------------
 
+    def _populate_datasets(self):
+        datasets = KOKUDO_DATASETS
+        labels = [
+            f"[{info['category']}] {info['name']} ({code})"
+            for code, info in datasets.items()
+        ]
+        # 一括追加し、ユーザーデータはシグナルを止めて後から設定
+        self.combo_dataset.blockSignals(True)
+        self.combo_dataset.setUpdatesEnabled(False)
+        self.combo_dataset.addItems(labels)
+        for idx, code in enumerate(datasets):
+            self.combo_dataset.setItemData(idx, code)
+        self.combo_dataset.setUpdatesEnabled(True)
+        self.combo_dataset.blockSignals(False)
+
     def _on_source_changed(self):
         self.moj_group.setVisible(self.radio_moj.isChecked())
         self.kokudo_group.setVisible(self.radio_kokudo.isChecked())
@@ -333,56 +491,56 @@ class DataLoaderPanel(QWidget):
             QMessageBox.warning(self, 'エラー', '都道府県を選択してください。')
             return
 
-        pref_codes = []
-        for item in selected:
-            code = item.text().split('(')[-1].rstrip(')')
-            pref_codes.append(code)
+        pref_codes = [item.data(Qt.UserRole) for item in selected]
 
         fiscal_year = self.edit_year.text().strip()
 
         ds_name = self.combo_dataset.currentText()
+        thread = _KokudoDownloadThread(
+            self.service, dataset_id, pref_codes, fiscal_year
+        )
+        thread.progress.connect(self._on_progress)
+        thread.finished_ok.connect(self._on_kokudo_done)
+        thread.error.connect(self._on_kokudo_error)
+        if not self._spawn_download(thread):
+            return
         self.lbl_kokudo_status.setText(
             f'ダウンロード中... ({ds_name})')
         self._set_busy(True)
         self.progress.setMaximum(0)  # インデターミネート（不確定）表示
-        self._download_thread = _KokudoDownloadThread(
-            self.service, dataset_id, pref_codes, fiscal_year
-        )
-        self._download_thread.progress.connect(self._on_progress)
-        self._download_thread.finished_ok.connect(self._on_kokudo_done)
-        self._download_thread.error.connect(self._on_kokudo_error)
-        self._download_thread.start()
 
     def _load_moj_auto(self):
         """マップ中心座標から登記所備付地図を自動取得."""
         # マップ中心座標を取得し EPSG:4326 に変換
-        center = canvas_center_to_4326(self.iface)
+        center = self._canvas_center_4326_cached()
         lat = center.y()
         lon = center.x()
         preferred_year = self.combo_moj_year.currentData() or ''
 
-        self._set_busy(True)
-        self.progress.setMaximum(0)  # indeterminate
-
-        self._download_thread = _MojAutoDownloadThread(
+        thread = _MojAutoDownloadThread(
             self.service, lat, lon, preferred_year
         )
-        self._download_thread.finished_ok.connect(self._on_moj_auto_done)
-        self._download_thread.error.connect(self._on_moj_auto_error)
-        self._download_thread.start()
+        thread.finished_ok.connect(self._on_moj_auto_done)
+        thread.error.connect(self._on_moj_auto_error)
+        if not self._spawn_download(thread):
+            return
+        self._set_busy(True)
+        self.progress.setMaximum(0)  # indeterminate
 
     def _load_fude_polygon(self):
         """筆ポリゴン FlatGeobuf をオンラインで読込."""
+        if self._detect_thread and self._detect_thread.isRunning():
+            return
         # マップ中心座標から都道府県を判定
         try:
-            center = canvas_center_to_4326(self.iface)
+            center = self._canvas_center_4326_cached()
             lat = center.y()
             lon = center.x()
         except Exception as e:
             QMessageBox.critical(self, 'エラー', f'座標取得に失敗しました:\n{e}')
             return
 
-        if not (20 <= lat <= 46 and 122 <= lon <= 154):
+        if not in_japan(lat, lon):
             QMessageBox.warning(
                 self, 'エラー',
                 f'現在の表示位置が日本国外です。\n'
@@ -391,78 +549,119 @@ class DataLoaderPanel(QWidget):
             )
             return
 
-        self._set_busy(True)
-        QApplication.setOverrideCursor(QCursor(Qt.WaitCursor))
-        QApplication.processEvents()
+        # 逆ジオコーダーの通信は現在地検出と同じワーカーで行う
+        self._start_pref_detect(lat, lon, self._on_fude_pref_detected)
 
-        try:
-            pref_code = self._resolve_pref_code(lat, lon)
-            if not pref_code:
-                QMessageBox.warning(
-                    self, 'エラー',
-                    '都道府県を判定できませんでした。\n'
-                    '地図上で陸地部分を表示してからお試しください。'
-                )
-                return
+    def _on_fude_pref_detected(self, pref_code):
+        """筆ポリゴン用の都道府県判定完了 — ダウンロードを開始."""
+        self.setEnabled(True)
+        if not pref_code:
+            QMessageBox.warning(
+                self, 'エラー',
+                '都道府県を判定できませんでした。\n'
+                '地図上で陸地部分を表示してからお試しください。'
+            )
+            return
 
-            pref_name = PREFECTURES.get(pref_code, pref_code)
+        # 同名レイヤが既にあれば重複追加しない
+        layer_name = f'筆ポリゴン_{pref_code}'
+        if QgsProject.instance().mapLayersByName(layer_name):
+            QMessageBox.information(
+                self, '完了',
+                f'同じレイヤが既に読込済みです: {layer_name}'
+            )
+            return
 
-            # 同名レイヤが既にあれば重複追加しない
-            layer_name = f'筆ポリゴン_{pref_code}'
-            for _lid, existing in QgsProject.instance().mapLayers().items():
-                if existing.name() == layer_name:
-                    QMessageBox.information(
-                        self, '完了',
-                        f'同じレイヤが既に読込済みです: {layer_name}'
-                    )
-                    return
+        thread = _FudeDownloadThread(self.service, pref_code)
+        thread.finished_ok.connect(self._on_fude_done)
+        thread.error.connect(self._on_fude_error)
+        if not self._spawn_download(thread):
+            return
+        self._set_busy(True)
+        self.progress.setMaximum(0)  # indeterminate
 
-            layer = self.service.load_fude_polygon_layer(pref_code)
-            if layer and layer.isValid():
-                QgsProject.instance().addMapLayer(layer)
-                QMessageBox.information(
-                    self, '完了',
-                    f'筆ポリゴンを追加しました: {pref_name}\n'
-                    f'({layer.featureCount()} features)'
-                )
-            else:
-                QMessageBox.warning(
-                    self, 'エラー',
-                    f'筆ポリゴンの読込に失敗しました。\n'
-                    f'都道府県: {pref_name} ({pref_code})\n'
-                    f'ログパネル(JLSA-Loader)を確認してください。'
-                )
-        except Exception as e:
-            QMessageBox.critical(self, 'エラー', str(e))
-        finally:
-            QApplication.restoreOverrideCursor()
-            self._set_busy(False)
+    def _clear_kokudo_cache(self):
+        """選択中データセットのキャッシュを削除."""
+        dataset_id = self.combo_dataset.currentData()
+        try:
+            removed = self.service.clear_kokudo_cache(dataset_id)
+        except OSError as e:
+            QMessageBox.warning(
+                self, 'エラー', f'キャッシュの削除に失敗しました:\n{e}')
+            return
+        if removed:
+            self.lbl_kokudo_status.setText(
+                f'キャッシュを削除しました ({dataset_id})')
+        else:
+            self.lbl_kokudo_status.setText(
+                f'キャッシュはありません ({dataset_id})')
 
     def _on_progress(self, current, total):
+        """ダウンロード進捗 (KB 単位). total=0 はサイズ不明."""
         if total > 0:
-            self.progress.setMaximum(total)
+            self.progress.setRange(0, total)
             self.progress.setValue(current)
             self.lbl_kokudo_status.setText(
-                f'ダウンロード中... ({current}/{total})')
+                f'ダウンロード中... '
+                f'({current / 1024:.1f}/{total / 1024:.1f} MB)')
+        else:
+            self.progress.setRange(0, 0)  # インデターミネート（不確定）表示
+            self.lbl_kokudo_status.setText(
+                f'ダウンロード中... ({current / 1024:.1f} MB)')
 
     def _on_kokudo_done(self, results):
-        """国土数値情報ダウンロード完了 — メインスレッドでレイヤ作成."""
-        self._set_busy(False)
+        """国土数値情報ダウンロード完了 — レイヤ準備をタスクで実行."""
         if not results:
+            self._set_busy(False)
             self.lbl_kokudo_status.setText('データが見つかりませんでした。')
             QMessageBox.warning(self, '結果', 'データが見つかりませんでした。')
             return
 
-        from ..core.kokudo_api_client import KokudoApiClient
-        added = 0
+        # ファイル探索・空間インデックス作成はワーカーで行い、
+        # QgsVectorLayer の作成はメインスレッドで行う（スレッドアフィニティ対策）
         self.lbl_kokudo_status.setText('レイヤを読込中...')
-        QApplication.processEvents()
-        for extract_dir, dataset_id, pref_code in results:
-            layer = KokudoApiClient._load_shapefile_dir(
-                extract_dir, dataset_id, pref_code)
-            if layer and layer.isValid():
-                QgsProject.instance().addMapLayer(layer)
-                added += 1
+        self.progress.setMaximum(100)
+        self.progress.setValue(0)
+        self._layer_task = QgsTask.fromFunction(
+            '国土数値情報 レイヤ準備', _prepare_kokudo_sources, results,
+            on_finished=self._on_kokudo_sources_ready,
+        )
+        self._layer_task.progressChanged.connect(
+            lambda p: self.progress.setValue(int(p)))
+        QgsApplication.taskManager().addTask(self._layer_task)
+
+    def _on_kokudo_sources_ready(self, exception, sources=None):
+        """レイヤ準備タスク完了 — メインスレッドでレイヤ作成・一括追加."""
+        task, self._layer_task = self._layer_task, None
+        self._set_busy(False)
+        # QgsTask.fromFunction は戻り値が偽 ([] を含む) だと sources を
+        # 渡さないため、中止は None ではなくタスクの状態で判定する
+        if task is not None and task.isCanceled():
+            self.lbl_kokudo_status.setText('中止しました。')
+            return
+        if exception is not None:
+            self.lbl_kokudo_status.setText(f'エラー: {exception}')
+            QMessageBox.critical(self, 'エラー', str(exception))
+            return
+        if not sources:
+            self.lbl_kokudo_status.setText('読込可能なデータが見つかりませんでした。')
+            QMessageBox.warning(
+                self, '結果', '読込可能なデータが見つかりませんでした。')
+            return
+
+        # 以降のレイヤ作成はメインスレッドを占有するため、ラベルだけ即時再描画
+        # (processEvents() はボタン操作の再入を招くので使わない)
+        self.lbl_kokudo_status.setText('レイヤを追加中...')
+        self.lbl_kokudo_status.repaint()
+        layers = []
+        for path, name in sources:
+            layer = QgsVectorLayer(path, name, 'ogr')
+            if layer.isValid():
+                self._configure_layer_for_display(layer, scale_limit=False)
+                layers.append(layer)
+        # 一括追加でレイヤツリー更新・再描画を1回にまとめる
+        QgsProject.instance().addMapLayers(layers)
+        added = len(layers)
 
         if added:
             self.lbl_kokudo_status.setText(f'完了: {added} レイヤを追加しました。')
@@ -484,13 +683,12 @@ class DataLoaderPanel(QWidget):
         self._set_busy(False)
 
         # 同名レイヤが既にあれば重複追加しない
-        for _lid, existing in QgsProject.instance().mapLayers().items():
-            if existing.name() == layer_name:
-                QMessageBox.information(
-                    self, '完了',
-                    f'同じレイヤが既に読込済みです: {layer_name}'
-                )
-                return
+        if QgsProject.instance().mapLayersByName(layer_name):
+            QMessageBox.information(
+                self, '完了',
+                f'同じレイヤが既に読込済みです: {layer_name}'
+            )
+            return
 
         # メインスレッドでレイヤを作成（スレッドアフィニティ対策）
         layer = QgsVectorLayer(source_path, layer_name, 'ogr')
@@ -498,20 +696,7 @@ class DataLoaderPanel(QWidget):
             QMessageBox.warning(self, 'エラー', '読込に失敗しました。')
             return
 
-        # パフォーマンス設定
-        dp = layer.dataProvider()
-        if dp.capabilities() & dp.CreateSpatialIndex:
-            dp.createSpatialIndex()
-        layer.setScaleBasedVisibility(True)
-        layer.setMinimumScale(25000)
-        layer.setMaximumScale(0)
-        simplify = QgsVectorSimplifyMethod()
-        simplify.setSimplifyHints(
-            QgsVectorSimplifyMethod.GeometrySimplification
-        )
-        simplify.setThreshold(1.0)
-        simplify.setForceLocalOptimization(True)
-        layer.setSimplifyMethod(simplify)
+        self._configure_layer_for_display(layer)
 
         QgsProject.instance().addMapLayer(layer)
         QMessageBox.information(
@@ -525,15 +710,89 @@ class DataLoaderPanel(QWidget):
         self._set_busy(False)
         QMessageBox.critical(self, 'エラー', f'登記所備付地図の取得に失敗しました:\n{msg}')
 
+    def _on_fude_done(self, source_path, layer_name):
+        """筆ポリゴン読込成功時 — メインスレッドでレイヤを再作成."""
+        self._set_busy(False)
+
+        layer = QgsVectorLayer(source_path, layer_name, 'ogr')
+        if not layer or not layer.isValid():
+            QMessageBox.warning(self, 'エラー', '筆ポリゴンの読込に失敗しました。')
+            return
+        self._configure_layer_for_display(layer)
+
+        QgsProject.instance().addMapLayer(layer)
+        pref_code = layer_name.rsplit('_', 1)[-1]
+        QMessageBox.information(
+            self, '完了',
+            f'筆ポリゴンを追加しました: {PREFECTURES.get(pref_code, pref_code)}\n'
+            f'({layer.featureCount()} features)'
+        )
+
+    def _on_fude_error(self, msg):
+        """筆ポリゴン読込エラー時."""
+        self._set_busy(False)
+        QMessageBox.warning(
+            self, 'エラー',
+            f'筆ポリゴンの読込に失敗しました。\n{msg}\n'
+            f'ログパネル(JLSA-Loader)を確認してください。'
+        )
+
     def _on_cancel(self):
-        if self._download_thread and self._download_thread.isRunning():
-            self._download_thread.terminate()
+        self._stop_download_thread()
+        if self._layer_task is not None:
+            self._layer_task.cancel()
         self._set_busy(False)
 
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
 
+    def _canvas_center_4326_cached(self):
+        """マップ中心を EPSG:4326 で返す（変換はキャンバス CRS ごとに再利用）."""
+        canvas = self.iface.mapCanvas()
+        center = canvas.center()
+        canvas_crs = canvas.mapSettings().destinationCrs()
+        if canvas_crs == self._crs_4326:
+            return center
+        key = canvas_crs.authid() or canvas_crs.toWkt()
+        transform = self._xform_cache.get(key)
+        if transform is None:
+            transform = QgsCoordinateTransform(
+                canvas_crs, self._crs_4326, QgsProject.instance())
+            self._xform_cache[key] = transform
+        return transform.transform(center)
+
+    def _spawn_download(self, thread) -> bool:
+        """ダウンロードスレッドを開始（前回分が実行中なら開始しない）."""
+        current = self._download_thread
+        if current is not None and not current.isFinished():
+            QgsMessageLog.logMessage(
+                '前回のダウンロードが実行中のため開始しません',
+                'JLSA-Loader', Qgis.Warning)
+            return False
+        thread.finished.connect(self._on_thread_cleared)
+        self._download_thread = thread
+        thread.start()
+        return True
+
+    def _on_thread_cleared(self):
+        """終了したスレッドの参照を解放."""
+        if self.sender() is self._download_thread:
+            self._download_thread = None
+
+    def _stop_download_thread(self):
+        """ダウンロードスレッドに中断を要求し、応答がなければ強制終了."""
+        thread = self._download_thread
+        if not thread or not thread.isRunning():
+            return
+        thread._stop.set()
+        if not thread.wait(3000):
+            QgsMessageLog.logMessage(
+                'ダウンロードスレッドが応答しないため強制終了します',
+                'JLSA-Loader', Qgis.Warning)
+            thread.terminate()
+            thread.wait()
+
     def _set_busy(self, busy: bool):
         self.btn_load.setEnabled(not busy)
         self.btn_cancel.setEnabled(busy)
@@ -543,6 +802,30 @@ class DataLoaderPanel(QWidget):
         else:
             self.progress.hide()
 
+    @staticmethod
+    def _configure_layer_for_display(layer, scale_limit: bool = True):
+        """描画パフォーマンス設定（空間インデックス・縮尺制限・簡略化）.
+
+        scale_limit=False は広域表示が前提のレイヤ（行政区域等）用で、
+        1:25000 の縮尺制限を掛けない。
+        """
+        dp = layer.dataProvider()
+        if (dp.capabilities() & dp.CreateSpatialIndex
+                and dp.hasSpatialIndex()
+                != QgsFeatureSource.SpatialIndexPresent):
+            dp.createSpatialIndex()
+        if scale_limit:
+            layer.setScaleBasedVisibility(True)
+            layer.setMinimumScale(25000)
+            layer.setMaximumScale(0)
+        simplify = QgsVectorSimplifyMethod()
+        simplify.setSimplifyHints(
+            QgsVectorSimplifyMethod.GeometrySimplification
+        )
+        simplify.setThreshold(1.0)
+        simplify.setForceLocalOptimization(True)
+        layer.setSimplifyMethod(simplify)
+
     def _update_plugin_status(self):
         bridge = PluginBridge()
         status = bridge.get_status_all()
@@ -556,109 +839,83 @@ class DataLoaderPanel(QWidget):
 
     def _detect_pref_from_map(self):
         """マップ中心座標から都道府県を判定し、リストで自動選択."""
-        self.lbl_kokudo_status.setText('位置を検出中...')
-        self.btn_detect_pref.setEnabled(False)
-        QApplication.setOverrideCursor(QCursor(Qt.WaitCursor))
-        QApplication.processEvents()
+        if self._detect_thread and self._detect_thread.isRunning():
+            return
 
         try:
-            center = canvas_center_to_4326(self.iface)
-            lat = center.y()
-            lon = center.x()
-            QgsMessageLog.logMessage(
-                f'現在地検出: lat={lat:.6f}, lon={lon:.6f}',
-                'JLSA-Loader', Qgis.Info)
-
-            # 日本国内チェック
-            if not (20 <= lat <= 46 and 122 <= lon <= 154):
-                self.lbl_kokudo_status.setText(
-                    f'検出失敗 (座標: {lat:.4f}, {lon:.4f} — 日本国外)')
-                QMessageBox.warning(
-                    self, 'エラー',
-                    f'現在の表示位置が日本国外です。\n'
-                    f'座標: 緯度={lat:.4f}, 経度={lon:.4f}\n'
-                    f'日本国内にマップを移動してください。'
-                )
-                return
-
-            self.lbl_kokudo_status.setText(
-                f'逆ジオコーダーに問い合わせ中... ({lat:.4f}, {lon:.4f})')
-            QApplication.processEvents()
-
-            pref_code = self._resolve_pref_code(lat, lon)
-
-            if not pref_code:
-                self.lbl_kokudo_status.setText('検出失敗')
-                QMessageBox.warning(
-                    self, 'エラー',
-                    f'都道府県を判定できませんでした。\n'
-                    f'座標: 緯度={lat:.4f}, 経度={lon:.4f}\n'
-                    f'地図上で陸地部分を表示してからお試しください。'
-                )
-                return
-
-            pref_name = PREFECTURES.get(pref_code, '')
-
-            # リストの該当都道府県を選択
-            self.list_pref.clearSelection()
-            for i in range(self.list_pref.count()):
-                item = self.list_pref.item(i)
-                if f'({pref_code})' in item.text():
-                    item.setSelected(True)
-                    self.list_pref.scrollToItem(item)
-                    break
-
-            self.lbl_kokudo_status.setText(f'検出済み: {pref_name}')
-
+            center = self._canvas_center_4326_cached()
         except Exception as e:
             QgsMessageLog.logMessage(
                 f'現在地検出エラー: {e}', 'JLSA-Loader', Qgis.Warning)
             self.lbl_kokudo_status.setText(f'検出エラー: {e}')
             QMessageBox.critical(
                 self, 'エラー', f'現在地の検出中にエラーが発生しました:\n{e}')
-        finally:
-            QApplication.restoreOverrideCursor()
-            self.btn_detect_pref.setEnabled(True)
+            return
+        lat = center.y()
+        lon = center.x()
+        QgsMessageLog.logMessage(
+            f'現在地検出: lat={lat:.6f}, lon={lon:.6f}',
+            'JLSA-Loader', Qgis.Info)
 
-    def _resolve_pref_code(self, lat: float, lon: float):
-        """複数の逆ジオコーダーで都道府県コードを取得（フォールバック付き）."""
-        # 1. GSI 逆ジオコーダー
-        try:
-            from ..core.moj_geojson_downloader import MojGeoJsonDownloader
-            downloader = MojGeoJsonDownloader()
-            city_code = downloader.resolve_city_code(lat, lon)
-            if city_code and len(city_code) >= 2:
-                return city_code[:2]
-        except Exception as e:
-            QgsMessageLog.logMessage(
-                f'GSI逆ジオコーダー失敗: {e}', 'JLSA-Loader', Qgis.Warning)
+        # 日本国内チェック
+        if not in_japan(lat, lon):
+            self.lbl_kokudo_status.setText(
+                f'検出失敗 (座標: {lat:.4f}, {lon:.4f} — 日本国外)')
+            QMessageBox.warning(
+                self, 'エラー',
+                f'現在の表示位置が日本国外です。\n'
+                f'座標: 緯度={lat:.4f}, 経度={lon:.4f}\n'
+                f'日本国内にマップを移動してください。'
+            )
+            return
 
-        self.lbl_kokudo_status.setText('GSI API 応答なし、別のAPIで再試行...')
-        QApplication.processEvents()
+        self._start_pref_detect(lat, lon, self._on_pref_detected)
 
-        # 2. HeartRails Geo API (フォールバック)
-        try:
-            from ..core.geocoder import Geocoder
-            geo = Geocoder()
-            results = geo.reverse_geocode(lon, lat)
-            if results:
-                pref_name = results[0].get('prefecture', '')
-                if pref_name:
-                    # 都道府県名 → コード逆引き
-                    for code, name in PREFECTURES.items():
-                        if name == pref_name:
-                            QgsMessageLog.logMessage(
-                                f'HeartRails検出: {pref_name} ({code})',
-                                'JLSA-Loader', Qgis.Info)
-                            return code
-        except Exception as e:
-            QgsMessageLog.logMessage(
-                f'HeartRails逆ジオコーダー失敗: {e}',
-                'JLSA-Loader', Qgis.Warning)
+    def _start_pref_detect(self, lat, lon, on_done):
+        """都道府県判定をワーカーで開始（完了時 on_done(pref_code)）."""
+        self.setEnabled(False)
+        self._detect_thread = _PrefDetectThread(lat, lon)
+        self._detect_thread.status.connect(self.lbl_kokudo_status.setText)
+        self._detect_thread.done.connect(on_done)
+        self._detect_thread.start()
+
+    def _on_pref_detected(self, pref_code):
+        """都道府県判定スレッド完了 — リストの該当都道府県を選択."""
+        self.setEnabled(True)
+        lat = self._detect_thread.lat
+        lon = self._detect_thread.lon
+
+        if not pref_code:
+            self.lbl_kokudo_status.setText('検出失敗')
+            QMessageBox.warning(
+                self, 'エラー',
+                f'都道府県を判定できませんでした。\n'
+                f'座標: 緯度={lat:.4f}, 経度={lon:.4f}\n'
+                f'地図上で陸地部分を表示してからお試しください。'
+            )
+            return
+
+        pref_name = PREFECTURES.get(pref_code, '')
+
+        # リストの該当都道府県を選択
+        self.list_pref.clearSelection()
+        item = self._pref_index.get(pref_code)
+        if item is not None:
+            item.setSelected(True)
+            self.list_pref.scrollToItem(item)
 
-        return None
+        self.lbl_kokudo_status.setText(f'検出済み: {pref_name}')
 
     def cleanup(self):
-        if self._download_thread and self._download_thread.isRunning():
-            self._download_thread.terminate()
-            self._download_thread.wait()
+        _resolve_pref_code_cached.cache_clear()
+        thread = self._detect_thread
+        if thread and thread.isRunning():
+            # 逆ジオコーダーが応答しなくてもアンロードを止めない
+            thread.done.disconnect()
+            if not thread.wait(3000):
+                QgsMessageLog.logMessage(
+                    '都道府県判定スレッドが応答しないため強制終了します',
+                    'JLSA-Loader', Qgis.Warning)
+                thread.terminate()
+                thread.wait()
+        self._stop_download_thread()
@@ -1,7 +1,9 @@
 # -*- coding: utf-8 -*-
 """地価情報タブ."""
 
-import math
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 
 from qgis.PyQt.QtWidgets import (
@@ -17,16 +19,29 @@ from qgis.core import (
 
 from ..core.land_price_api import LandPriceApiClient
 from ..core.config import Config
+from ..services.cache_manager import CacheManager
+
+# 取得時の座標ダンプ等の詳細ログ (False で文字列整形ごと省略)
+_LOG_ENABLED = True
+
+# zoom = round(log2(1440 / span)) を 13-15 に丸めた場合の境界 (度)
+_Z15_MAX_SPAN = 1440.0 / 2 ** 14.5
+_Z14_MAX_SPAN = 1440.0 / 2 ** 13.5
 
 
 class _FetchThread(QThread):
     """地価データ取得ワーカースレッド.
 
-    指定年で結果が0件の場合、1年前を自動リトライする。
+    指定年で結果が0件の場合は1年前の結果を使う。前回その年が0件だった
+    場合に限り、待ち時間を減らすため1年前の取得も並行して開始し、
+    指定年にデータがあれば打ち切る（通常は API 呼出を倍にしない）。
     """
     finished_ok = pyqtSignal(list, int)  # features, actual_year
     error = pyqtSignal(str)
 
+    # 0件だった (year, price_classification)。次回はフォールバックと並行取得
+    _empty_years = set()
+
     def __init__(self, client, extent, zoom, year, price_classification):
         super().__init__()
         self.client = client
@@ -34,53 +49,91 @@ class _FetchThread(QThread):
         self.zoom = zoom
         self.year = year
         self.price_classification = price_classification
+        self._cancelled = False
+
+    def _is_cancelled(self):
+        return self._cancelled
+
+    def _fetch(self, year, cancel_cb):
+        return self.client.fetch_prices_for_extent(
+            *self.extent, zoom=self.zoom, year=year,
+            price_classification=self.price_classification,
+            cancel_cb=cancel_cb,
+        )
 
     def run(self):
+        fallback_year = self.year - 1
+        hint_key = (self.year, self.price_classification)
         try:
-            # 指定年で取得
-            feats = self.client.fetch_prices_for_extent(
-                *self.extent, zoom=self.zoom, year=self.year,
-                price_classification=self.price_classification,
-            )
-            if feats:
-                self.finished_ok.emit(feats, self.year)
+            if hint_key in self._empty_years:
+                feats, actual_year = self._fetch_racing(fallback_year)
+            else:
+                feats = self._fetch(self.year, self._is_cancelled)
+                actual_year = self.year
+                if not feats and not self._cancelled:
+                    self._log_fallback(fallback_year)
+                    feats = self._fetch(fallback_year, self._is_cancelled)
+                    actual_year = fallback_year
+            if self._cancelled:
                 return
-
-            # 0件 → 1年前でリトライ
-            fallback_year = self.year - 1
-            self.client._log(
-                f'year={self.year} で0件。year={fallback_year} でリトライ',
-                Qgis.Info,
-            )
-            feats = self.client.fetch_prices_for_extent(
-                *self.extent, zoom=self.zoom, year=fallback_year,
-                price_classification=self.price_classification,
-            )
-            self.finished_ok.emit(feats, fallback_year)
+            if actual_year == self.year:
+                self._empty_years.discard(hint_key)
+            else:
+                self._empty_years.add(hint_key)
+            self.finished_ok.emit(feats, actual_year)
         except Exception as e:
             self.error.emit(str(e))
 
+    def _fetch_racing(self, fallback_year):
+        """指定年と1年前を並行取得し (features, actual_year) を返す."""
+        fallback_stop = threading.Event()
+
+        def fallback_cancelled():
+            return self._cancelled or fallback_stop.is_set()
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            primary = pool.submit(self._fetch, self.year, self._is_cancelled)
+            fallback = pool.submit(self._fetch, fallback_year,
+                                   fallback_cancelled)
+            feats = primary.result()
+            if feats:
+                fallback_stop.set()
+                fallback.cancel()
+                return feats, self.year
+            self._log_fallback(fallback_year)
+            return fallback.result(), fallback_year
+
+    def _log_fallback(self, fallback_year):
+        # 0件 → 1年前の結果を使用
+        self.client._log(
+            f'year={self.year} で0件。year={fallback_year} の結果を使用',
+            Qgis.Info,
+        )
+
     @staticmethod
     def calc_zoom_for_extent(xmin, ymin, xmax, ymax):
         """マップ範囲から適切なzoomレベルを自動算出 (13-15)."""
-        width = abs(xmax - xmin)
-        height = abs(ymax - ymin)
-        span = max(width, height)
+        span = max(abs(xmax - xmin), abs(ymax - ymin))
         if span <= 0:
             return 14
-        z = math.log2(1440.0 / span) if span > 0 else 14
-        z = int(round(z))
-        return max(13, min(15, z))
+        if span < _Z15_MAX_SPAN:
+            return 15
+        return 14 if span <= _Z14_MAX_SPAN else 13
 
 
 class LandPricePanel(QWidget):
     """Land price information tab."""
 
+    _WGS84 = QgsCoordinateReferenceSystem('EPSG:4326')
+
     def __init__(self, iface, parent=None):
         super().__init__(parent)
         self.iface = iface
         self.config = Config()
         self._thread = None
+        self._client = None
+        self._xform_cache = {}  # (src authid, dst authid) -> transform
+        QgsProject.instance().crsChanged.connect(self._xform_cache.clear)
         self._setup_ui()
 
     def _setup_ui(self):
@@ -140,6 +193,12 @@ class LandPricePanel(QWidget):
     def _log(msg, level=Qgis.Info):
         QgsMessageLog.logMessage(msg, 'JLSA-LandPricePanel', level)
 
+    @staticmethod
+    def _logf(fmt, *args, level=Qgis.Info):
+        """詳細ログ. 無効時は % 整形も行わない."""
+        if _LOG_ENABLED:
+            QgsMessageLog.logMessage(fmt % args, 'JLSA-LandPricePanel', level)
+
     def _on_fetch(self):
         api_key = self.config.get_api_key()
         if not api_key:
@@ -153,23 +212,20 @@ class LandPricePanel(QWidget):
         extent = canvas.extent()
         map_crs = canvas.mapSettings().destinationCrs()
 
-        self._log(f'マップCRS: {map_crs.authid()}')
-        self._log(f'マップ範囲 (元CRS): xmin={extent.xMinimum():.6f}, '
-                   f'ymin={extent.yMinimum():.6f}, '
-                   f'xmax={extent.xMaximum():.6f}, '
-                   f'ymax={extent.yMaximum():.6f}')
+        self._logf('マップCRS: %s', map_crs.authid())
+        self._logf('マップ範囲 (元CRS): xmin=%.6f, ymin=%.6f, '
+                   'xmax=%.6f, ymax=%.6f',
+                   extent.xMinimum(), extent.yMinimum(),
+                   extent.xMaximum(), extent.yMaximum())
 
         # CRS変換: マップCRS → EPSG:4326
-        wgs84 = QgsCoordinateReferenceSystem('EPSG:4326')
-        if map_crs != wgs84:
-            transform = QgsCoordinateTransform(
-                map_crs, wgs84, QgsProject.instance()
-            )
+        if map_crs.authid() != 'EPSG:4326':
+            transform = self._get_transform(map_crs, self._WGS84)
             extent = transform.transformBoundingBox(extent)
-            self._log(f'EPSG:4326に変換後: xmin={extent.xMinimum():.6f}, '
-                       f'ymin={extent.yMinimum():.6f}, '
-                       f'xmax={extent.xMaximum():.6f}, '
-                       f'ymax={extent.yMaximum():.6f}')
+            self._logf('EPSG:4326に変換後: xmin=%.6f, ymin=%.6f, '
+                       'xmax=%.6f, ymax=%.6f',
+                       extent.xMinimum(), extent.yMinimum(),
+                       extent.xMaximum(), extent.yMaximum())
 
         xmin, ymin = extent.xMinimum(), extent.yMinimum()
         xmax, ymax = extent.xMaximum(), extent.yMaximum()
@@ -190,13 +246,13 @@ class LandPricePanel(QWidget):
         price_classification = self.combo_dataset.currentData()
         year = self.spin_year.value()
 
-        self._log(f'取得開始: priceClassification={price_classification}, '
-                   f'zoom={zoom}, year={year}, '
-                   f'extent=({xmin:.6f}, {ymin:.6f}, {xmax:.6f}, {ymax:.6f})')
+        self._logf('取得開始: priceClassification=%s, zoom=%d, year=%d, '
+                   'extent=(%.6f, %.6f, %.6f, %.6f)',
+                   price_classification, zoom, year, xmin, ymin, xmax, ymax)
 
         self.lbl_status.setText(f'取得中... (zoom={zoom}, year={year})')
 
-        client = LandPriceApiClient(api_key)
+        client = self._get_client(api_key)
         self._set_busy(True)
 
         self._thread = _FetchThread(
@@ -214,8 +270,7 @@ class LandPricePanel(QWidget):
             QMessageBox.information(self, '結果', 'データが見つかりませんでした。')
             return
 
-        api_key = self.config.get_api_key()
-        client = LandPriceApiClient(api_key)
+        client = self._get_client(self.config.get_api_key())
         layer = client.create_point_layer(
             features, layer_name=f'地価情報_{actual_year}'
         )
@@ -241,6 +296,26 @@ class LandPricePanel(QWidget):
         self._log(f'エラー: {msg}', Qgis.Critical)
         QMessageBox.critical(self, 'エラー', msg)
 
+    def _get_transform(self, src, dst):
+        """CRS 変換を再利用（プロジェクト CRS 変更時に破棄）."""
+        key = (src.authid() or src.toWkt(), dst.authid())
+        transform = self._xform_cache.get(key)
+        if transform is None:
+            transform = QgsCoordinateTransform(src, dst, QgsProject.instance())
+            self._xform_cache[key] = transform
+        return transform
+
+    def _get_client(self, api_key):
+        """API クライアントを再利用（キー変更時のみ作り直す）."""
+        if self._client is None or self._client.api_key != api_key:
+            if self._client is not None:
+                self._client.close()
+            cache_dir = None
+            if self.config.is_cache_enabled():
+                cache_dir = os.path.join(CacheManager().base_dir, 'landprice')
+            self._client = LandPriceApiClient(api_key, cache_dir=cache_dir)
+        return self._client
+
     def _set_busy(self, busy):
         self.btn_fetch.setEnabled(not busy)
         if busy:
@@ -249,6 +324,18 @@ class LandPricePanel(QWidget):
             self.progress.hide()
 
     def cleanup(self):
+        try:
+            QgsProject.instance().crsChanged.disconnect(self._xform_cache.clear)
+        except TypeError:
+            pass
         if self._thread and self._thread.isRunning():
-            self._thread.terminate()
-            self._thread.wait()
+            # 中止フラグを立て、接続を閉じて受信待ちを解除する
+            self._thread._cancelled = True
+            self._thread.client.close()
+            if not self._thread.wait(2000):
+                self._log('取得スレッドが応答しないため強制終了します',
+                          Qgis.Warning)
+                self._thread.terminate()
+                self._thread.wait()
+        if self._client is not None:
+            self._client.close()
@@ -7,6 +7,11 @@ from qgis.PyQt.QtWidgets import (
 )
 from qgis.PyQt.QtCore import Qt
 
+from . import (
+    data_loader_panel, progress_viewer, parcel_search_panel,
+    land_price_panel, settings_dialog,
+)
+
 
 class MainDialog(QDialog):
     """Main dialog with five tabs."""
@@ -25,27 +30,26 @@ class MainDialog(QDialog):
     def _setup_ui(self):
         layout = QVBoxLayout(self)
 
-        # Tab widget
+        # Tab widget — 各パネルは初めてタブを開いた時に生成する
         self.tabs = QTabWidget()
 
-        # Lazy-import panels to avoid circular imports
-        from .data_loader_panel import DataLoaderPanel
-        from .progress_viewer import ProgressViewerPanel
-        from .parcel_search_panel import ParcelSearchPanel
-        from .land_price_panel import LandPricePanel
-        from .settings_dialog import SettingsPanel
-
-        self.data_loader = DataLoaderPanel(self.iface, self)
-        self.progress_viewer = ProgressViewerPanel(self.iface, self)
-        self.parcel_search = ParcelSearchPanel(self.iface, self)
-        self.land_price = LandPricePanel(self.iface, self)
-        self.settings = SettingsPanel(self)
-
-        self.tabs.addTab(self.data_loader, 'データ取得')
-        self.tabs.addTab(self.progress_viewer, '進捗ビュー')
-        self.tabs.addTab(self.parcel_search, '地番検索')
-        self.tabs.addTab(self.land_price, '地価情報')
-        self.tabs.addTab(self.settings, '設定')
+        # (属性名, タブ名, 生成関数)
+        self._tab_specs = [
+            ('data_loader', 'データ取得',
+             lambda: data_loader_panel.DataLoaderPanel(self.iface, self)),
+            ('progress_viewer', '進捗ビュー',
+             lambda: progress_viewer.ProgressViewerPanel(self.iface, self)),
+            ('parcel_search', '地番検索',
+             lambda: parcel_search_panel.ParcelSearchPanel(self.iface, self)),
+            ('land_price', '地価情報',
+             lambda: land_price_panel.LandPricePanel(self.iface, self)),
+            ('settings', '設定',
+             lambda: settings_dialog.SettingsPanel(self)),
+        ]
+        self._detected_pref = None  # 進捗ビューで検出した (pref_code, pref_name)
+        for attr, title, _factory in self._tab_specs:
+            setattr(self, attr, None)
+            self.tabs.addTab(QWidget(), title)
 
         layout.addWidget(self.tabs)
 
@@ -58,22 +62,52 @@ class MainDialog(QDialog):
         status_layout.addWidget(self.progress_bar)
         layout.addLayout(status_layout)
 
-        # --- Signal wiring ---
-        # Tab change → parcel search auto-detect
+        # Tab change → 遅延生成 / parcel search auto-detect
         self.tabs.currentChanged.connect(self._on_tab_changed)
-
-        # Progress viewer prefecture detection → parcel search
-        self.progress_viewer.prefecture_detected.connect(
-            self.parcel_search.on_prefecture_detected
-        )
-
-        # Parcel search status → main status bar
-        self.parcel_search.status_message.connect(self.set_status)
+        self._ensure_panel(self.tabs.currentIndex())
+
+    def _ensure_panel(self, index):
+        """タブのパネルを返す（未生成ならプレースホルダと差し替える）."""
+        if index < 0:
+            return None
+        attr, title, factory = self._tab_specs[index]
+        panel = getattr(self, attr)
+        if panel is not None:
+            return panel
+
+        panel = factory()
+        setattr(self, attr, panel)
+        placeholder = self.tabs.widget(index)
+        self.tabs.blockSignals(True)
+        self.tabs.removeTab(index)
+        self.tabs.insertTab(index, panel, title)
+        self.tabs.setCurrentIndex(index)
+        self.tabs.blockSignals(False)
+        placeholder.deleteLater()
+        self._wire_panel(attr, panel)
+        return panel
+
+    def _wire_panel(self, attr, panel):
+        """生成したパネルのシグナルを接続."""
+        if attr == 'progress_viewer':
+            # Progress viewer prefecture detection → parcel search
+            panel.prefecture_detected.connect(self._on_prefecture_detected)
+        elif attr == 'parcel_search':
+            # Parcel search status → main status bar
+            panel.status_message.connect(self.set_status)
+            if self._detected_pref:
+                panel.on_prefecture_detected(*self._detected_pref)
+
+    def _on_prefecture_detected(self, pref_code, pref_name):
+        """進捗ビューの都道府県検出を地番検索へ中継（未生成なら保持）."""
+        self._detected_pref = (pref_code, pref_name)
+        if self.parcel_search is not None:
+            self.parcel_search.on_prefecture_detected(pref_code, pref_name)
 
     def _on_tab_changed(self, index):
         """タブ切替ハンドラ."""
-        widget = self.tabs.widget(index)
-        if widget is self.parcel_search:
+        widget = self._ensure_panel(index)
+        if widget is not None and widget is self.parcel_search:
             self.parcel_search.on_tab_activated()
 
     def set_status(self, message: str):
@@ -2,60 +2,129 @@
 """地番検索タブ."""
 
 import csv
+import os
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import chain
 
 from qgis.PyQt.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGroupBox,
     QLabel, QComboBox, QLineEdit, QPushButton, QMessageBox,
     QFileDialog, QApplication, QProgressBar, QCheckBox,
 )
-from qgis.PyQt.QtCore import Qt, QThread, pyqtSignal
+from qgis.PyQt.QtCore import (
+    Qt, QObject, QRunnable, QThreadPool, QTimer, pyqtSignal,
+)
 from qgis.core import (
-    QgsProject, QgsVectorLayer, QgsPointXY, QgsWkbTypes,
+    QgsProject, QgsVectorLayer, QgsWkbTypes,
     QgsCoordinateTransform, QgsCoordinateReferenceSystem,
     QgsGeometry, QgsRectangle, QgsVectorSimplifyMethod,
+    QgsFeatureSource, QgsMessageLog, Qgis,
 )
 from qgis.gui import QgsMapToolEmitPoint, QgsRubberBand, QgsVertexMarker
 from qgis.PyQt.QtGui import QColor
 
 from ..core.parcel_searcher import ParcelSearcher
 from ..core.crs_utils import (
-    canvas_center_to_4326, layer_extent_to_canvas, zoom_to_feature_extent,
+    canvas_center_to_4326, in_japan, layer_extent_to_canvas,
+    zoom_to_feature_extent,
 )
 from .widgets.parcel_info_card import ParcelInfoCard
 
 
-class _ParcelAutoLoadThread(QThread):
-    """MOJデータの非同期ダウンロード.
+@lru_cache(maxsize=1)
+def _get_downloader():
+    """MojGeoJsonDownloader を1つだけ生成して使い回す."""
+    from ..core.moj_geojson_downloader import MojGeoJsonDownloader
+    from ..services.cache_manager import CacheManager
+    return MojGeoJsonDownloader(cache_dir=CacheManager().base_dir)
+
+
+class _ParcelAutoLoadSignals(QObject):
+    """_ParcelAutoLoadRunnable の通知用 (QRunnable は QObject ではないため)."""
+
+    finished_ok = pyqtSignal(str, str)  # source_path, layer_name
+    error = pyqtSignal(str)
+
+
+class _ParcelAutoLoadRunnable(QRunnable):
+    """MOJデータの非同期ダウンロード (QThreadPool で実行).
 
     QgsVectorLayer は QObject でスレッドアフィニティがあるため、
     ワーカースレッドで作成したレイヤをメインスレッドで使うとデータが空になる。
     そのためファイルパスとレイヤ名だけを返し、メインスレッドでレイヤを再作成する。
     """
 
-    finished_ok = pyqtSignal(str, str)  # source_path, layer_name
-    error = pyqtSignal(str)
-
     def __init__(self, lat, lon):
         super().__init__()
         self.lat = lat
         self.lon = lon
+        self.signals = _ParcelAutoLoadSignals()
+        self._stop = threading.Event()
+        self._done = threading.Event()
+
+    def cancel(self):
+        """中断を要求する（ダウンロードは次のチャンク境界で打ち切られる）."""
+        self._stop.set()
+
+    def wait(self, timeout):
+        """run() の終了を最大 timeout 秒待つ. 終了していれば True."""
+        return self._done.wait(timeout)
 
     def run(self):
         try:
             from ..services.data_loader_service import DataLoaderService
             service = DataLoaderService()
-            layer = service.load_moj_from_extent(self.lat, self.lon)
+            layer = service.load_moj_from_extent(
+                self.lat, self.lon, stop_check=self._stop.is_set)
+            if self._stop.is_set():
+                return
             if layer and layer.isValid():
-                self.finished_ok.emit(layer.source(), layer.name())
+                self.signals.finished_ok.emit(layer.source(), layer.name())
             else:
-                self.error.emit('MOJデータの取得に失敗しました。')
+                self.signals.error.emit('MOJデータの取得に失敗しました。')
+        except InterruptedError:
+            pass
         except Exception as e:
-            self.error.emit(str(e))
+            if not self._stop.is_set():
+                self.signals.error.emit(str(e))
+        finally:
+            self._done.set()
+
+
+class _CityCodeResolveSignals(QObject):
+    """_CityCodeResolveRunnable の通知用."""
+
+    # lat, lon, city_code ('' = 判定不可), 判定時のマップ中心 (QgsPointXY, map CRS)
+    resolved = pyqtSignal(float, float, str, object)
+
+
+class _CityCodeResolveRunnable(QRunnable):
+    """逆ジオコーダーによる市区町村コード取得 (QThreadPool で実行)."""
+
+    def __init__(self, lat, lon, map_center):
+        super().__init__()
+        self.lat = lat
+        self.lon = lon
+        self.map_center = map_center
+        self.signals = _CityCodeResolveSignals()
+
+    def run(self):
+        try:
+            city_code = _get_downloader().resolve_city_code(
+                self.lat, self.lon)
+        except Exception:
+            city_code = None
+        self.signals.resolved.emit(
+            self.lat, self.lon, city_code or '', self.map_center)
 
 
 class ParcelSearchPanel(QWidget):
     """Parcel search tab with attribute search and map click."""
 
+    _CRS_4326 = QgsCoordinateReferenceSystem('EPSG:4326')
+
     status_message = pyqtSignal(str)
     auto_load_started = pyqtSignal()
     auto_load_finished = pyqtSignal()
@@ -67,16 +136,37 @@ class ParcelSearchPanel(QWidget):
         self._map_tool = None
         self._prev_map_tool = None
         self._rubber_band = None
+        self._highlight_scale = None  # ハイライト簡略化時のキャンバス縮尺
         self._search_area_band = None
         self._current_feature = None
-        self._auto_load_thread = None
+        self._current_info = None  # _current_feature の属性 dict
+        self._field_names_cache = {}  # layer_id -> [field name]
+        self._xform_cache = {}  # (src, dst) -> QgsCoordinateTransform
+        self._auto_load_task = None  # 実行中の _ParcelAutoLoadRunnable
+        self._resolve_task = None    # 実行中の _CityCodeResolveRunnable
+        self._city_code_cache = {}   # (round(lat,3), round(lon,3)) -> city_code
         # 2段階検出用の状態
         self._detect_marker = None
         self._detected_lat = None
         self._detected_lon = None
         self._detected_map_center = None
+        self._detected_city_code = None
+        self._service = None  # DataLoaderService (遅延生成)
+        self._layer_extent_4326_cache = {}  # layer_id -> (xmin, ymin, xmax, ymax)
+        self._watched_layers = {}  # レイヤID -> (layer, 破棄スロット)
+        self._named_layers = {}  # レイヤID -> (layer, nameChanged スロット)
+        project = QgsProject.instance()
+        project.layerWillBeRemoved.connect(self._invalidate_layer_cache)
         self._setup_ui()
         self._refresh_layers()
+        # 以降のレイヤ追加・削除はコンボへ差分反映する
+        project.layersAdded.connect(self._on_layers_added)
+        project.layersRemoved.connect(self._on_layers_removed)
+        project.crsChanged.connect(self._clear_xform_cache)
+        self.iface.mapCanvas().destinationCrsChanged.connect(
+            self._clear_xform_cache)
+        self.iface.mapCanvas().scaleChanged.connect(
+            self._on_canvas_scale_changed)
 
     def _setup_ui(self):
         layout = QVBoxLayout(self)
@@ -90,6 +180,12 @@ class ParcelSearchPanel(QWidget):
         self.btn_detect.clicked.connect(self._on_detect_clicked)
         detect_row.addWidget(self.btn_detect)
         detect_row.addStretch()
+        self.btn_clear_moj_cache = QPushButton('キャッシュ削除')
+        self.btn_clear_moj_cache.setToolTip(
+            '検出した市区町村のダウンロード済み登記所備付地図を削除し、'
+            '次回取得時に再ダウンロードします。')
+        self.btn_clear_moj_cache.clicked.connect(self._clear_moj_cache)
+        detect_row.addWidget(self.btn_clear_moj_cache)
         detect_layout.addLayout(detect_row)
 
         self.lbl_auto_status = QLabel('')
@@ -208,26 +304,49 @@ class ParcelSearchPanel(QWidget):
 
     def _detect_position(self):
         """1回目: マップ中心から位置を判定しマーカー表示."""
-        center_4326 = canvas_center_to_4326(self.iface)
+        # 判定中にパンされてもマーカーと取得位置がずれないよう、ここで確定する
+        map_center = self.iface.mapCanvas().center()
+        center_4326 = canvas_center_to_4326(self.iface, self._get_transform)
         lat = center_4326.y()
         lon = center_4326.x()
 
         # 日本国内チェック
-        if not (20 <= lat <= 46 and 122 <= lon <= 154):
+        if not in_japan(lat, lon):
             self.lbl_auto_status.setText(
                 '日本国外のため検出できません。日本国内にマップを移動してください。'
             )
             return
 
-        # 逆ジオコーダーで地名を取得（UIブロック短いので同期で可）
-        from ..core.moj_geojson_downloader import MojGeoJsonDownloader
-        downloader = MojGeoJsonDownloader()
-        city_code = downloader.resolve_city_code(lat, lon)
+        # 逆ジオコーダーで市区町村コードを取得（通信はワーカーで行う）
+        cache_key = (round(lat, 3), round(lon, 3))
+        city_code = self._city_code_cache.get(cache_key)
+        if city_code:
+            self._on_city_code_resolved(lat, lon, city_code, map_center)
+            return
+        if self._resolve_task is not None:
+            return
+
+        self.lbl_auto_status.setText('市区町村を判定中...')
+        self.auto_progress.show()
+        self.btn_detect.setEnabled(False)
+        task = _CityCodeResolveRunnable(lat, lon, map_center)
+        task.signals.resolved.connect(self._on_city_code_resolved)
+        self._resolve_task = task
+        QThreadPool.globalInstance().start(task)
+
+    def _on_city_code_resolved(self, lat, lon, city_code, map_center):
+        """市区町村コード判定後: 既存レイヤ選択 or マーカー表示."""
+        if self._resolve_task is not None:
+            self._resolve_task = None
+            self.auto_progress.hide()
+            self.btn_detect.setEnabled(True)
         if not city_code:
             self.lbl_auto_status.setText(
                 '市区町村を判定できませんでした。マップを移動して再度お試しください。'
             )
             return
+        self._city_code_cache[(round(lat, 3), round(lon, 3))] = city_code
+        self._detected_city_code = city_code
 
         # 既存レイヤがあるかチェック
         existing = self._find_moj_layer_for_position(lat, lon)
@@ -238,9 +357,7 @@ class ParcelSearchPanel(QWidget):
             self.status_message.emit(f'MOJレイヤ検出: {existing.name()}')
             return
 
-        # マーカー表示
-        canvas = self.iface.mapCanvas()
-        map_center = canvas.center()
+        # マーカー表示（判定した地点に置く。現在のキャンバス中心ではない）
         self._show_detect_marker(map_center)
 
         # 状態を保存
@@ -267,9 +384,67 @@ class ParcelSearchPanel(QWidget):
         self._detected_map_center = None
         self.btn_detect.setText('現在地から検出')
 
+        # ディスクキャッシュがあればスレッドを使わずその場で読込
+        city_code = self._detected_city_code
+        cached = (self._get_service().find_cached_moj(city_code)
+                  if city_code else None)
+        if cached:
+            self._add_moj_layer(cached, f'登記所備付地図_{city_code}')
+            return
+
         # ダウンロード開始
         self._start_download(lat, lon)
 
+    def _get_service(self):
+        if self._service is None:
+            from ..services.data_loader_service import DataLoaderService
+            self._service = DataLoaderService()
+        return self._service
+
+    def _clear_moj_cache(self):
+        """検出済み市区町村の MOJ キャッシュを削除."""
+        city_code = self._detected_city_code
+        if not city_code:
+            self.lbl_auto_status.setText(
+                '先に「現在地から検出」で市区町村を判定してください。')
+            return
+        service = self._get_service()
+
+        # 読込中のレイヤがキャッシュを開いていると削除できない（Windows）ため、
+        # 確認のうえ先にプロジェクトから外す
+        cached = {os.path.normcase(os.path.abspath(p))
+                  for p in service.moj_cache_paths(city_code)}
+        in_use = [
+            layer for layer in QgsProject.instance().mapLayers().values()
+            if os.path.normcase(os.path.abspath(
+                layer.source().split('|')[0])) in cached
+        ]
+        if in_use:
+            names = '\n'.join(layer.name() for layer in in_use)
+            reply = QMessageBox.question(
+                self, 'キャッシュ削除',
+                f'次のレイヤがキャッシュを使用しています。\n{names}\n\n'
+                'レイヤを削除してからキャッシュを削除しますか？',
+                QMessageBox.Yes | QMessageBox.No,
+            )
+            if reply != QMessageBox.Yes:
+                return
+            QgsProject.instance().removeMapLayers(
+                [layer.id() for layer in in_use])
+
+        try:
+            removed = service.clear_moj_cache(city_code)
+        except OSError as e:
+            QMessageBox.warning(
+                self, 'エラー', f'キャッシュの削除に失敗しました:\n{e}')
+            return
+        if removed:
+            self.lbl_auto_status.setText(
+                f'キャッシュを削除しました ({city_code})')
+        else:
+            self.lbl_auto_status.setText(
+                f'キャッシュはありません ({city_code})')
+
     def _reset_detect_state(self):
         """検出状態をリセット."""
         self._clear_detect_marker()
@@ -284,31 +459,31 @@ class ParcelSearchPanel(QWidget):
 
     def _show_detect_marker(self, point):
         """マップ上に検出位置マーカーを表示."""
-        self._clear_detect_marker()
-        canvas = self.iface.mapCanvas()
-        self._detect_marker = QgsVertexMarker(canvas)
+        if self._detect_marker is None:
+            marker = QgsVertexMarker(self.iface.mapCanvas())
+            marker.setColor(QColor(0, 100, 255))
+            marker.setFillColor(QColor(0, 100, 255, 128))
+            marker.setIconSize(15)
+            marker.setIconType(QgsVertexMarker.ICON_CROSS)
+            marker.setPenWidth(3)
+            self._detect_marker = marker
         self._detect_marker.setCenter(point)
-        self._detect_marker.setColor(QColor(0, 100, 255))
-        self._detect_marker.setFillColor(QColor(0, 100, 255, 128))
-        self._detect_marker.setIconSize(15)
-        self._detect_marker.setIconType(QgsVertexMarker.ICON_CROSS)
-        self._detect_marker.setPenWidth(3)
+        self._detect_marker.show()
 
     def _clear_detect_marker(self):
-        """マーカーを消去."""
+        """マーカーを非表示（アイテムは cleanup まで使い回す）."""
         if self._detect_marker:
-            canvas = self.iface.mapCanvas()
-            canvas.scene().removeItem(self._detect_marker)
-            self._detect_marker = None
+            self._detect_marker.hide()
 
     # ------------------------------------------------------------------
     # Auto-detect on tab activated
     # ------------------------------------------------------------------
 
     def on_tab_activated(self):
-        """タブ表示時: レイヤ一覧更新 + 既存MOJレイヤがあれば自動選択."""
-        self._refresh_layers()
+        """タブ表示時: 既存MOJレイヤがあれば自動選択.
 
+        レイヤ一覧は layersAdded/layersRemoved で常に最新に保たれている。
+        """
         layer = self._find_moj_layer_for_current_position()
         if layer:
             self._select_layer_in_combo(layer)
@@ -318,15 +493,16 @@ class ParcelSearchPanel(QWidget):
 
     def _find_moj_layer_for_current_position(self):
         """プロジェクト内の「登記所備付地図_*」レイヤから現在位置を含むものを検索."""
-        center_4326 = canvas_center_to_4326(self.iface)
+        center_4326 = canvas_center_to_4326(self.iface, self._get_transform)
         return self._find_moj_layer_for_position(center_4326.y(), center_4326.x())
 
     def _find_moj_layer_for_position(self, lat, lon):
         """指定座標を含む「登記所備付地図_*」レイヤを検索."""
-        crs_4326 = QgsCoordinateReferenceSystem('EPSG:4326')
-        pt_4326 = QgsPointXY(lon, lat)
-
-        for _lid, layer in QgsProject.instance().mapLayers().items():
+        # 国外の座標を含む MOJ レイヤは無いので、範囲計算の前に打ち切る
+        if not in_japan(lat, lon):
+            return None
+        project = QgsProject.instance()
+        for layer in project.mapLayers().values():
             if not isinstance(layer, QgsVectorLayer):
                 continue
             if not layer.name().startswith('登記所備付地図'):
@@ -334,26 +510,38 @@ class ParcelSearchPanel(QWidget):
             if layer.geometryType() != QgsWkbTypes.PolygonGeometry:
                 continue
 
-            layer_crs = layer.crs()
-            center_pt = QgsPointXY(pt_4326)
-            if layer_crs != crs_4326:
-                xform = QgsCoordinateTransform(
-                    crs_4326, layer_crs, QgsProject.instance()
-                )
-                center_pt = xform.transform(center_pt)
-
-            if layer.extent().contains(center_pt):
+            xmin, ymin, xmax, ymax = self._layer_extent_4326(layer, project)
+            if xmin <= lon <= xmax and ymin <= lat <= ymax:
                 return layer
 
         return None
 
+    def _layer_extent_4326(self, layer, project=None):
+        """レイヤ範囲 (EPSG:4326) をキャッシュ付きで返す."""
+        lid = layer.id()
+        bbox = self._layer_extent_4326_cache.get(lid)
+        if bbox is None:
+            self._watch_layer(layer)
+            extent = layer.extent()
+            layer_crs = layer.crs()
+            if layer_crs != self._CRS_4326:
+                xform = QgsCoordinateTransform(
+                    layer_crs, self._CRS_4326,
+                    project or QgsProject.instance()
+                )
+                extent = xform.transformBoundingBox(extent)
+            bbox = (extent.xMinimum(), extent.yMinimum(),
+                    extent.xMaximum(), extent.yMaximum())
+            self._layer_extent_4326_cache[lid] = bbox
+        return bbox
+
     # ------------------------------------------------------------------
     # Download
     # ------------------------------------------------------------------
 
     def _start_download(self, lat, lon):
         """MOJデータの非同期ダウンロードを開始."""
-        if self._auto_load_thread and self._auto_load_thread.isRunning():
+        if self._auto_load_task is not None:
             return
 
         self.lbl_auto_status.setText('MOJデータを取得中...')
@@ -362,21 +550,27 @@ class ParcelSearchPanel(QWidget):
         self.auto_load_started.emit()
         self.status_message.emit('MOJデータを取得中...')
 
-        self._auto_load_thread = _ParcelAutoLoadThread(lat, lon)
-        self._auto_load_thread.finished_ok.connect(self._on_auto_load_done)
-        self._auto_load_thread.error.connect(self._on_auto_load_error)
-        self._auto_load_thread.start()
+        task = _ParcelAutoLoadRunnable(lat, lon)
+        task.signals.finished_ok.connect(self._on_auto_load_done)
+        task.signals.error.connect(self._on_auto_load_error)
+        self._auto_load_task = task
+        QThreadPool.globalInstance().start(task)
 
     def _on_auto_load_done(self, source_path, layer_name):
         """自動ダウンロード完了 — メインスレッドでレイヤを再作成."""
+        self._auto_load_task = None
         self.auto_progress.hide()
         self.btn_detect.setEnabled(True)
         self.auto_load_finished.emit()
+        self._add_moj_layer(source_path, layer_name)
+
+    def _add_moj_layer(self, source_path, layer_name):
+        """取得済みファイルからレイヤを作成してプロジェクトに追加・選択."""
+        project = QgsProject.instance()
 
         # 同名レイヤが既にあれば重複追加しない
-        for _lid, existing in QgsProject.instance().mapLayers().items():
+        for existing in project.mapLayers().values():
             if existing.name() == layer_name:
-                self._refresh_layers()
                 self._select_layer_in_combo(existing)
                 self._show_search_area_boundary(existing)
                 self.lbl_auto_status.setText(f'既存レイヤを使用: {layer_name}')
@@ -391,8 +585,10 @@ class ParcelSearchPanel(QWidget):
             return
 
         # パフォーマンス設定（MojGeoJsonDownloader.load_as_layer と同等）
+        # GPKG は R-tree を内蔵しているので作成不要（GeoJSON のままの場合のみ）
         dp = layer.dataProvider()
-        if dp.capabilities() & dp.CreateSpatialIndex:
+        if (layer.hasSpatialIndex() != QgsFeatureSource.SpatialIndexPresent
+                and dp.capabilities() & dp.CreateSpatialIndex):
             dp.createSpatialIndex()
         layer.setScaleBasedVisibility(True)
         layer.setMinimumScale(25000)
@@ -405,12 +601,14 @@ class ParcelSearchPanel(QWidget):
         simplify.setForceLocalOptimization(True)
         layer.setSimplifyMethod(simplify)
 
-        # プロジェクトに追加
-        QgsProject.instance().addMapLayer(layer)
+        # 大字一覧を先読みしておき、コンボ更新時はキャッシュから設定
+        self._oaza_aza_map(layer)
 
-        # コンボ更新・選択
-        self._refresh_layers()
-        self._select_layer_in_combo(layer)
+        # 追加・選択・スタイル適用をまとめて1回の再描画にする
+        with self._canvas_render_suspended():
+            project.addMapLayer(layer)
+            # コンボへは layersAdded で追加済み。選択のみ行う
+            self._select_layer_in_combo(layer)
 
         # 検索エリア枠表示
         self._show_search_area_boundary(layer)
@@ -420,6 +618,7 @@ class ParcelSearchPanel(QWidget):
 
     def _on_auto_load_error(self, msg):
         """自動ダウンロードエラー."""
+        self._auto_load_task = None
         self.auto_progress.hide()
         self.btn_detect.setEnabled(True)
         self.auto_load_finished.emit()
@@ -432,22 +631,22 @@ class ParcelSearchPanel(QWidget):
 
     def _show_search_area_boundary(self, layer):
         """青い境界枠の表示."""
-        self._clear_search_area_boundary()
-        canvas = self.iface.mapCanvas()
-        self._search_area_band = QgsRubberBand(canvas, QgsWkbTypes.PolygonGeometry)
-        self._search_area_band.setColor(QColor(0, 100, 255, 180))
-        self._search_area_band.setFillColor(QColor(0, 100, 255, 20))
-        self._search_area_band.setWidth(2)
+        if self._search_area_band is None:
+            band = QgsRubberBand(self.iface.mapCanvas(),
+                                 QgsWkbTypes.PolygonGeometry)
+            band.setColor(QColor(0, 100, 255, 180))
+            band.setFillColor(QColor(0, 100, 255, 20))
+            band.setWidth(2)
+            self._search_area_band = band
 
         extent = layer_extent_to_canvas(layer, self.iface)
         rect_geom = QgsGeometry.fromRect(extent)
         self._search_area_band.setToGeometry(rect_geom)
 
     def _clear_search_area_boundary(self):
-        """枠の消去."""
+        """枠の消去（アイテムは cleanup まで使い回す）."""
         if self._search_area_band:
-            self._search_area_band.reset()
-            self._search_area_band = None
+            self._search_area_band.reset(QgsWkbTypes.PolygonGeometry)
 
     # ------------------------------------------------------------------
     # Layer combo helpers
@@ -455,11 +654,9 @@ class ParcelSearchPanel(QWidget):
 
     def _select_layer_in_combo(self, layer):
         """コンボボックスでレイヤを自動選択."""
-        target_id = layer.id()
-        for i in range(self.combo_layer.count()):
-            if self.combo_layer.itemData(i) == target_id:
-                self.combo_layer.setCurrentIndex(i)
-                return
+        idx = self.combo_layer.findData(layer.id())
+        if idx >= 0:
+            self.combo_layer.setCurrentIndex(idx)
 
     # ------------------------------------------------------------------
     # Prefecture detection from progress viewer
@@ -477,10 +674,73 @@ class ParcelSearchPanel(QWidget):
     # ------------------------------------------------------------------
 
     def _refresh_layers(self):
-        self.combo_layer.clear()
+        current_id = self.combo_layer.currentData()
+        names, ids = [], []
         for lid, layer in QgsProject.instance().mapLayers().items():
-            if isinstance(layer, QgsVectorLayer) and layer.geometryType() == QgsWkbTypes.PolygonGeometry:
-                self.combo_layer.addItem(layer.name(), lid)
+            if self._is_polygon_layer(layer):
+                names.append(layer.name())
+                ids.append(lid)
+                self._track_layer_name(layer)
+
+        # 一括追加し、選択変更の通知は最後に1回だけ行う
+        self.combo_layer.blockSignals(True)
+        self.combo_layer.clear()
+        self.combo_layer.addItems(names)
+        for i, lid in enumerate(ids):
+            self.combo_layer.setItemData(i, lid)
+        if current_id in ids:
+            self.combo_layer.setCurrentIndex(ids.index(current_id))
+        self.combo_layer.blockSignals(False)
+        self._on_layer_changed()
+
+    def _on_layers_added(self, layers):
+        """追加されたポリゴンレイヤをコンボ末尾に追加."""
+        for layer in layers:
+            if self._is_polygon_layer(layer) \
+                    and self.combo_layer.findData(layer.id()) < 0:
+                # 空のコンボへの初回追加時のみ currentIndexChanged が発生する
+                self.combo_layer.addItem(layer.name(), layer.id())
+                self._track_layer_name(layer)
+
+    def _on_layers_removed(self, layer_ids):
+        """削除されたレイヤをコンボから取り除く."""
+        for lid in layer_ids:
+            self._named_layers.pop(lid, None)
+            self._watched_layers.pop(lid, None)
+            idx = self.combo_layer.findData(lid)
+            if idx >= 0:
+                self.combo_layer.removeItem(idx)
+
+    def _track_layer_name(self, layer):
+        """レイヤ名の変更をコンボ表示に反映する."""
+        lid = layer.id()
+        if lid in self._named_layers:
+            return
+        slot = lambda layer=layer, lid=lid: self._on_layer_renamed(lid, layer)
+        layer.nameChanged.connect(slot)
+        # cleanup で切断できるようスロットを保持する
+        self._named_layers[lid] = (layer, slot)
+
+    def _on_layer_renamed(self, lid, layer):
+        idx = self.combo_layer.findData(lid)
+        if idx >= 0:
+            self.combo_layer.setItemText(idx, layer.name())
+
+    @staticmethod
+    def _is_polygon_layer(layer):
+        return (isinstance(layer, QgsVectorLayer)
+                and layer.geometryType() == QgsWkbTypes.PolygonGeometry)
+
+    @staticmethod
+    def _fill_value_combo(combo, values):
+        """先頭に（全て）を置いて値一覧を一括設定（シグナルは送らない）."""
+        combo.blockSignals(True)
+        combo.clear()
+        combo.addItems(['（全て）'] + list(values))
+        combo.setItemData(0, '')
+        for i, val in enumerate(values, 1):
+            combo.setItemData(i, val)
+        combo.blockSignals(False)
 
     def _get_target_layer(self) -> QgsVectorLayer:
         lid = self.combo_layer.currentData()
@@ -489,18 +749,14 @@ class ParcelSearchPanel(QWidget):
         return None
 
     def _on_layer_changed(self):
-        self.combo_oaza.clear()
-        self.combo_oaza.addItem('（全て）', '')
-        self.combo_aza.clear()
-        self.combo_aza.addItem('（全て）', '')
-
         layer = self._get_target_layer()
+        self._fill_value_combo(
+            self.combo_oaza, self._unique_oaza(layer) if layer else [])
+        self._on_oaza_changed()
         if not layer:
             self._clear_search_area_boundary()
             return
-
-        for val in self.searcher.get_unique_oaza(layer):
-            self.combo_oaza.addItem(val, val)
+        self._field_names(layer)
 
         # MOJレイヤ選択時に検索エリア枠を表示
         if layer.name().startswith('登記所備付地図'):
@@ -510,17 +766,34 @@ class ParcelSearchPanel(QWidget):
 
         # 枠線のみ表示の状態を適用
         if self.chk_outline_only.isChecked():
-            self._apply_outline_style(layer)
+            with self._canvas_render_suspended():
+                self._apply_outline_style(layer)
 
     def _on_outline_only_changed(self, checked):
         """枠線のみ表示の切替."""
         layer = self._get_target_layer()
         if not layer:
             return
-        if checked:
-            self._apply_outline_style(layer)
-        else:
-            self._apply_filled_style(layer)
+        with self._canvas_render_suspended():
+            if checked:
+                self._apply_outline_style(layer)
+            else:
+                self._apply_filled_style(layer)
+
+    @contextmanager
+    def _canvas_render_suspended(self):
+        """ブロック内のキャンバス再描画を止め、終了時に1回だけ描画する.
+
+        triggerRepaint はレイヤの描画キャッシュ破棄のために残し、
+        実際の描画は setRenderFlag(True) 時の refresh に集約される。
+        """
+        canvas = self.iface.mapCanvas()
+        was_enabled = canvas.renderFlag()
+        canvas.setRenderFlag(False)
+        try:
+            yield
+        finally:
+            canvas.setRenderFlag(was_enabled)
 
     def _apply_outline_style(self, layer):
         """レイヤを枠線のみスタイルに変更."""
@@ -549,14 +822,56 @@ class ParcelSearchPanel(QWidget):
         layer.triggerRepaint()
 
     def _on_oaza_changed(self):
-        self.combo_aza.clear()
-        self.combo_aza.addItem('（全て）', '')
         oaza = self.combo_oaza.currentData() or ''
         layer = self._get_target_layer()
-        if not layer or not oaza:
+        values = self._unique_aza(layer, oaza) if layer and oaza else []
+        self._fill_value_combo(self.combo_aza, values)
+
+    # ------------------------------------------------------------------
+    # 大字/字 一覧キャッシュ
+    # ------------------------------------------------------------------
+
+    def _watch_layer(self, layer):
+        """編集終了・データ/CRS 変更時にそのレイヤのキャッシュを破棄する."""
+        lid = layer.id()
+        if lid in self._watched_layers:
             return
-        for val in self.searcher.get_unique_aza(layer, oaza):
-            self.combo_aza.addItem(val, val)
+        invalidate = lambda *_args, lid=lid: self._invalidate_layer_cache(lid)
+        for signal in self._watched_signals(layer):
+            signal.connect(invalidate)
+        self._watched_layers[lid] = (layer, invalidate)
+
+    @staticmethod
+    def _watched_signals(layer):
+        return (layer.editingStopped, layer.dataChanged, layer.crsChanged)
+
+    def _field_names(self, layer):
+        """レイヤのフィールド名一覧（属性 dict 生成用）をキャッシュ付きで返す."""
+        lid = layer.id()
+        names = self._field_names_cache.get(lid)
+        if names is None:
+            self._watch_layer(layer)
+            names = layer.fields().names()
+            self._field_names_cache[lid] = names
+        return names
+
+    def _oaza_aza_map(self, layer):
+        """{大字: [字]}（キャッシュは ParcelSearcher 側で保持）."""
+        # 編集終了・データ変更時に searcher.invalidate() が呼ばれるよう監視する
+        self._watch_layer(layer)
+        return self.searcher.get_oaza_aza_map(layer)
+
+    def _unique_oaza(self, layer):
+        return list(self._oaza_aza_map(layer))
+
+    def _unique_aza(self, layer, oaza):
+        return self._oaza_aza_map(layer).get(oaza, [])
+
+    def _invalidate_layer_cache(self, layer_id):
+        """レイヤ削除・編集終了時にキャッシュを破棄."""
+        self._layer_extent_4326_cache.pop(layer_id, None)
+        self._field_names_cache.pop(layer_id, None)
+        self.searcher.invalidate(layer_id)
 
     # ------------------------------------------------------------------
     # Search
@@ -635,10 +950,7 @@ class ParcelSearchPanel(QWidget):
         canvas_crs = self.iface.mapCanvas().mapSettings().destinationCrs()
         layer_crs = layer.crs()
         if canvas_crs != layer_crs:
-            xform = QgsCoordinateTransform(
-                canvas_crs, layer_crs, QgsProject.instance()
-            )
-            point = xform.transform(point)
+            point = self._get_transform(canvas_crs, layer_crs).transform(point)
 
         feature = self.searcher.search_by_point(layer, point)
         if feature:
@@ -646,23 +958,47 @@ class ParcelSearchPanel(QWidget):
         else:
             self._clear_result()
 
+    def _get_transform(self, src, dst):
+        """CRS 変換を再利用（プロジェクト/キャンバス CRS 変更時に破棄）."""
+        key = (src.authid() or src.toWkt(), dst.authid() or dst.toWkt())
+        transform = self._xform_cache.get(key)
+        if transform is None:
+            transform = QgsCoordinateTransform(src, dst, QgsProject.instance())
+            self._xform_cache[key] = transform
+        return transform
+
+    def _clear_xform_cache(self, *_args):
+        self._xform_cache.clear()
+
     # ------------------------------------------------------------------
     # Result display
     # ------------------------------------------------------------------
 
     def _show_result(self, feature):
         self._current_feature = feature
-        info = self.searcher.feature_to_dict(feature)
-        self.info_card.show_info(info)
-        self._highlight_feature(feature)
+        layer = self._get_target_layer()
+        info = self.searcher.feature_to_dict(
+            feature, self._field_names(layer) if layer else None)
+        self._current_info = info
 
         self.btn_zoom.setEnabled(True)
         self.btn_select.setEnabled(True)
         self.btn_copy.setEnabled(True)
         self.btn_csv_export.setEnabled(True)
 
+        # カード描画とハイライト作成は次のイベントループで行う。
+        # 連続クリック時は最後の結果だけが描画される
+        QTimer.singleShot(0, lambda: self._render_result(feature))
+
+    def _render_result(self, feature):
+        if feature is not self._current_feature:
+            return
+        self.info_card.show_info(self._current_info)
+        self._highlight_feature(feature)
+
     def _clear_result(self):
         self._current_feature = None
+        self._current_info = None
         self.info_card.clear_info()
         self._clear_highlight()
         self.btn_zoom.setEnabled(False)
@@ -671,18 +1007,49 @@ class ParcelSearchPanel(QWidget):
         self.btn_csv_export.setEnabled(False)
 
     def _highlight_feature(self, feature):
-        self._clear_highlight()
+        if self._rubber_band is None:
+            band = QgsRubberBand(self.iface.mapCanvas(),
+                                 QgsWkbTypes.PolygonGeometry)
+            band.setColor(QColor(255, 0, 0, 128))
+            band.setWidth(2)
+            self._rubber_band = band
+        self._set_highlight_geometry(feature)
+
+    def _set_highlight_geometry(self, feature):
+        """キャンバス解像度 (0.5px) で簡略化したジオメトリをハイライトに設定."""
         canvas = self.iface.mapCanvas()
-        self._rubber_band = QgsRubberBand(canvas, QgsWkbTypes.PolygonGeometry)
-        self._rubber_band.setColor(QColor(255, 0, 0, 128))
-        self._rubber_band.setWidth(2)
-        self._rubber_band.setToGeometry(feature.geometry(),
-                                        self._get_target_layer())
+        geom = QgsGeometry(feature.geometry())
+        layer = self._get_target_layer()
+        canvas_crs = canvas.mapSettings().destinationCrs()
+        if layer and layer.crs() != canvas_crs:
+            geom.transform(self._get_transform(layer.crs(), canvas_crs))
+        simple = geom.simplify(canvas.mapUnitsPerPixel() * 0.5)
+        if simple.isEmpty():  # 画面上で潰れるほど小さい筆はそのまま
+            simple = geom
+        self._rubber_band.setToGeometry(simple)
+        self._highlight_scale = canvas.scale()
+
+    def _on_canvas_scale_changed(self, scale):
+        """縮尺が2倍以上変わったらハイライトの簡略化をやり直す."""
+        if not self._current_feature or not self._highlight_scale:
+            return
+        ratio = scale / self._highlight_scale
+        if ratio < 0.5 or ratio > 2.0:
+            self._set_highlight_geometry(self._current_feature)
 
     def _clear_highlight(self):
+        self._highlight_scale = None
         if self._rubber_band:
-            self._rubber_band.reset()
-            self._rubber_band = None
+            self._rubber_band.reset(QgsWkbTypes.PolygonGeometry)
+
+    def _remove_canvas_items(self):
+        """ハイライト・枠・マーカーのアイテムをキャンバスから削除."""
+        scene = self.iface.mapCanvas().scene()
+        for attr in ('_rubber_band', '_search_area_band', '_detect_marker'):
+            item = getattr(self, attr)
+            if item is not None:
+                scene.removeItem(item)
+                setattr(self, attr, None)
 
     # ------------------------------------------------------------------
     # Actions
@@ -704,8 +1071,7 @@ class ParcelSearchPanel(QWidget):
     def _copy_attrs(self):
         if not self._current_feature:
             return
-        info = self.searcher.feature_to_dict(self._current_feature)
-        text = '\n'.join(f'{k}: {v}' for k, v in info.items())
+        text = '\n'.join(f'{k}: {v}' for k, v in self._current_info.items())
         QApplication.clipboard().setText(text)
 
     def _export_csv(self):
@@ -716,20 +1082,75 @@ class ParcelSearchPanel(QWidget):
         )
         if not path:
             return
-        info = self.searcher.feature_to_dict(self._current_feature)
-        with open(path, 'w', encoding='utf-8-sig', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=info.keys())
-            writer.writeheader()
-            writer.writerow(info)
+        layer = self._get_target_layer()
+        self._write_features_csv(
+            path, [self._current_feature],
+            self._field_names(layer) if layer else None)
         QMessageBox.information(self, '完了', f'{path} に出力しました。')
 
+    def _write_features_csv(self, path, features, field_names=None):
+        """地物を1行ずつ CSV に書き出す（全件をメモリに展開しない）.
+
+        ヘッダは先頭行の属性名から作成する。複数件の出力にもそのまま使える。
+        """
+        rows = (self.searcher.feature_to_dict(feat, field_names)
+                for feat in features)
+        first = next(rows, None)
+        if first is None:
+            return
+        with open(path, 'w', encoding='utf-8-sig', newline='',
+                  buffering=1024 * 1024) as f:
+            writer = csv.DictWriter(f, fieldnames=list(first.keys()))
+            writer.writeheader()
+            writer.writerows(chain((first,), rows))
+
     def cleanup(self):
+        project = QgsProject.instance()
+        for signal, slot in (
+            (project.layerWillBeRemoved, self._invalidate_layer_cache),
+            (project.layersAdded, self._on_layers_added),
+            (project.layersRemoved, self._on_layers_removed),
+            (project.crsChanged, self._clear_xform_cache),
+            (self.iface.mapCanvas().destinationCrsChanged,
+             self._clear_xform_cache),
+            (self.iface.mapCanvas().scaleChanged,
+             self._on_canvas_scale_changed),
+        ):
+            try:
+                signal.disconnect(slot)
+            except TypeError:
+                pass
+        for layer, slot in self._named_layers.values():
+            try:
+                layer.nameChanged.disconnect(slot)
+            except (TypeError, RuntimeError):
+                # 切断済み、またはレイヤが既に破棄されている
+                pass
+        self._named_layers.clear()
+        for layer, slot in self._watched_layers.values():
+            try:
+                for signal in self._watched_signals(layer):
+                    signal.disconnect(slot)
+            except (TypeError, RuntimeError):
+                pass
+        self._watched_layers.clear()
         self._clear_highlight()
-        self._clear_search_area_boundary()
-        self._clear_detect_marker()
-        if self._auto_load_thread and self._auto_load_thread.isRunning():
-            self._auto_load_thread.terminate()
-            self._auto_load_thread.wait()
+        self._remove_canvas_items()
+        if self._auto_load_task is not None:
+            # 実行中のダウンロードは中止要求で打ち切る（結果は通知しない）
+            self._auto_load_task.cancel()
+            if not self._auto_load_task.wait(5.0):
+                QgsMessageLog.logMessage(
+                    'MOJ自動取得の終了待ちがタイムアウトしました',
+                    'JLSA-Loader', Qgis.Warning)
+            self._auto_load_task = None
+        if self._resolve_task is not None:
+            try:
+                self._resolve_task.signals.resolved.disconnect(
+                    self._on_city_code_resolved)
+            except TypeError:
+                pass
+            self._resolve_task = None
         if self._map_tool:
             canvas = self.iface.mapCanvas()
             try:
@@ -5,10 +5,14 @@ from qgis.PyQt.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGroupBox, QRadioButton,
     QLabel, QComboBox, QCheckBox, QPushButton, QFileDialog,
     QMessageBox, QListWidget, QAbstractItemView, QProgressBar,
+    QProgressDialog,
 )
-from qgis.PyQt.QtCore import Qt, QThread, pyqtSignal
+from qgis.PyQt.QtCore import Qt, QThread, QTimer, pyqtSignal
 from qgis.PyQt.QtGui import QColor
-from qgis.core import QgsProject, QgsVectorLayer, QgsWkbTypes
+from qgis.core import (
+    QgsProject, QgsVectorLayer, QgsWkbTypes, QgsCoordinateTransform,
+    QgsMessageLog, Qgis,
+)
 from qgis.gui import QgsVertexMarker
 
 from ..core.chiseki_progress import ChisekiProgressManager
@@ -43,25 +47,80 @@ class _AdminDownloadThread(QThread):
     """
     finished_ok = pyqtSignal(str, str)  # shp_path, layer_name
     error = pyqtSignal(str)
+    progress = pyqtSignal(int)  # 0-100、全体サイズ不明なら -1
 
     def __init__(self, service, pref_code):
         super().__init__()
         self.service = service
         self.pref_code = pref_code
+        self._last_percent = None
+
+    def _report(self, received, total):
+        # 受信チャンク毎に呼ばれるので、値が変わった時だけ通知する
+        percent = received * 100 // total if total else -1
+        if percent != self._last_percent:
+            self._last_percent = percent
+            self.progress.emit(percent)
 
     def run(self):
         try:
             shp_path, layer_name = self.service.download_admin_boundary_path(
-                self.pref_code
+                self.pref_code, progress_callback=self._report,
+                stop_check=self.isInterruptionRequested,
             )
             if shp_path:
                 self.finished_ok.emit(shp_path, layer_name)
             else:
                 self.error.emit('行政区域データが見つかりませんでした。')
+        except InterruptedError:
+            pass
+        except Exception as e:
+            self.error.emit(str(e))
+
+
+class _CsvExportThread(QThread):
+    """絞り込み済みレコードのバックグラウンド CSV 出力."""
+    progress = pyqtSignal(int)  # 書込済み行数
+    finished_ok = pyqtSignal(str)  # output_path
+    error = pyqtSignal(str)
+
+    def __init__(self, manager, records, path):
+        super().__init__()
+        self.manager = manager
+        self.records = records
+        self.path = path
+
+    def run(self):
+        try:
+            self.manager.export_csv(
+                self.records, self.path,
+                progress_callback=self.progress.emit,
+                stop_check=self.isInterruptionRequested,
+            )
+            self.finished_ok.emit(self.path)
+        except InterruptedError:
+            pass
         except Exception as e:
             self.error.emit(str(e))
 
 
+class _CsvLoadThread(QThread):
+    """進捗 CSV のバックグラウンド読込."""
+    records_ready = pyqtSignal(list)
+
+    def __init__(self, manager):
+        super().__init__()
+        self.manager = manager
+
+    def run(self):
+        try:
+            records = self.manager.load_csv()
+        except Exception as e:
+            self.manager._log(f'CSV 読込失敗: {e}', Qgis.Warning)
+            records = []
+        self.records_ready.emit(records)
+
+
 class ProgressViewerPanel(QWidget):
     """Cadastral survey progress viewer tab."""
 
@@ -73,11 +132,34 @@ class ProgressViewerPanel(QWidget):
         self.manager = ChisekiProgressManager()
         self.service = DataLoaderService()
         self._records = []
+        self._records_version = 0  # _load_data 毎に更新
+        self._filter_cache = {}    # (version, pref_code, statuses) -> records
+        self._charted_records = None  # チャートに最後に渡したリスト
+        # CSV 読込完了まではレイヤ作成・出力を受け付けない
+        self._records_loaded = False
+        self._busy = False
+        self._create_pending = False  # 読込中に要求されたレイヤ作成
         self._download_thread = None
+        self._downloader = None
+        self._load_thread = None
+        self._export_thread = None
+        self._admin_layer_cache = {}  # layer_id -> 行政区域レイヤか
+        QgsProject.instance().layersRemoved.connect(
+            self._forget_admin_layers)
+        # キャンバス CRS -> EPSG:4326 の変換 (CRS 変更時に破棄)
+        self._xform_cache = {}
+        QgsProject.instance().crsChanged.connect(self._clear_xform_cache)
+        iface.mapCanvas().destinationCrsChanged.connect(
+            self._clear_xform_cache)
         self._marker = None
         self._detected_center = None  # QgsPointXY in map CRS
         self._detected_pref_code = None
         self._detected_pref_name = None
+        # フィルタの連続変更を1回のチャート更新にまとめる
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.setInterval(50)
+        self._update_timer.timeout.connect(self._update_chart_now)
         self._setup_ui()
 
     def _setup_ui(self):
@@ -100,14 +182,25 @@ class ProgressViewerPanel(QWidget):
         pref_row = QHBoxLayout()
         pref_row.addWidget(QLabel('都道府県:'))
         self.combo_pref = QComboBox()
-        for code, name in _PREFS:
-            self.combo_pref.addItem(name, code)
+        self.combo_pref.setUpdatesEnabled(False)
+        self.combo_pref.addItems([name for _code, name in _PREFS])
+        for i, (code, _name) in enumerate(_PREFS):
+            self.combo_pref.setItemData(i, code)
+        self.combo_pref.setUpdatesEnabled(True)
+        # 都道府県コード -> (コンボ index, 名称)
+        self._pref_index = {
+            code: (i, name) for i, (code, name) in enumerate(_PREFS)}
         pref_row.addWidget(self.combo_pref)
         self.btn_detect_pref = QPushButton('現在地から設定')
         self.btn_detect_pref.clicked.connect(self._detect_pref_from_map)
         pref_row.addWidget(self.btn_detect_pref)
         filter_layout.addLayout(pref_row)
 
+        self.download_progress = QProgressBar()
+        self.download_progress.setFixedHeight(8)
+        self.download_progress.hide()
+        filter_layout.addWidget(self.download_progress)
+
         filter_layout.addWidget(QLabel('ステータス:'))
         self.chk_done = QCheckBox('完了')
         self.chk_done.setChecked(True)
@@ -124,6 +217,12 @@ class ProgressViewerPanel(QWidget):
         status_row.addWidget(self.chk_not_started)
         filter_layout.addLayout(status_row)
 
+        # フィルタ変更時にチャートを更新（同じ条件はキャッシュから返る）
+        self.combo_pref.currentIndexChanged.connect(self._update_chart)
+        for chk in (self.chk_done, self.chk_inprog,
+                    self.chk_suspended, self.chk_not_started):
+            chk.toggled.connect(self._update_chart)
+
         layout.addWidget(filter_group)
 
         # Chart widget
@@ -172,7 +271,7 @@ class ProgressViewerPanel(QWidget):
         canvas = self.iface.mapCanvas()
         map_center = canvas.center()  # map CRS
 
-        center_4326 = canvas_center_to_4326(self.iface)
+        center_4326 = canvas_center_to_4326(self.iface, self._get_transform)
         lat = center_4326.y()
         lon = center_4326.x()
 
@@ -182,9 +281,7 @@ class ProgressViewerPanel(QWidget):
             return
 
         # 1回目: 逆ジオコーダーで都道府県判定 + マーカー表示
-        from ..core.moj_geojson_downloader import MojGeoJsonDownloader
-        downloader = MojGeoJsonDownloader()
-        city_code = downloader.resolve_city_code(lat, lon)
+        city_code = self._get_downloader().resolve_city_code(lat, lon)
 
         if not city_code or len(city_code) < 2:
             QMessageBox.warning(
@@ -197,14 +294,9 @@ class ProgressViewerPanel(QWidget):
         pref_code = city_code[:2]
 
         # コンボボックスで該当都道府県を選択
-        pref_name = ''
-        for i in range(self.combo_pref.count()):
-            if self.combo_pref.itemData(i) == pref_code:
-                self.combo_pref.setCurrentIndex(i)
-                pref_name = self.combo_pref.itemText(i)
-                break
-
-        self._update_chart()
+        idx, pref_name = self._pref_index.get(pref_code, (-1, ''))
+        if idx >= 0:
+            self.combo_pref.setCurrentIndex(idx)
 
         # マーカーを表示
         self._show_marker(map_center)
@@ -220,6 +312,26 @@ class ProgressViewerPanel(QWidget):
         # ボタンラベル変更
         self.btn_detect_pref.setText(f'{pref_name} で確定')
 
+    def _get_transform(self, src, dst):
+        """CRS 変換を再利用（プロジェクト/キャンバス CRS 変更時に破棄）."""
+        key = (src.authid() or src.toWkt(), dst.authid() or dst.toWkt())
+        transform = self._xform_cache.get(key)
+        if transform is None:
+            transform = QgsCoordinateTransform(src, dst, QgsProject.instance())
+            self._xform_cache[key] = transform
+        return transform
+
+    def _clear_xform_cache(self, *_args):
+        self._xform_cache.clear()
+
+    def _get_downloader(self):
+        """逆ジオコーダー用の MojGeoJsonDownloader（クリック毎に作らない）."""
+        if self._downloader is None:
+            from ..core.moj_geojson_downloader import MojGeoJsonDownloader
+            self._downloader = MojGeoJsonDownloader(
+                cache_dir=self.service.cache.base_dir)
+        return self._downloader
+
     def _confirm_pref_setting(self):
         """2回目クリック: 行政区域取得・進捗レイヤ作成を実行."""
         pref_code = self._detected_pref_code
@@ -258,6 +370,7 @@ class ProgressViewerPanel(QWidget):
         self._download_thread = _AdminDownloadThread(self.service, pref_code)
         self._download_thread.finished_ok.connect(self._on_admin_download_done)
         self._download_thread.error.connect(self._on_admin_download_error)
+        self._download_thread.progress.connect(self._on_admin_download_progress)
         self._download_thread.start()
 
     def _show_marker(self, point):
@@ -300,25 +413,59 @@ class ProgressViewerPanel(QWidget):
         # 自動で進捗レイヤを作成
         self._create_layer()
 
+    def _on_admin_download_progress(self, percent):
+        if percent < 0:
+            self.download_progress.setRange(0, 0)  # indeterminate
+        else:
+            self.download_progress.setRange(0, 100)
+            self.download_progress.setValue(percent)
+
     def _on_admin_download_error(self, msg):
         self._set_busy(False)
         QMessageBox.critical(self, 'エラー', f'行政区域データの取得に失敗しました:\n{msg}')
 
     def _set_busy(self, busy: bool):
+        self._busy = busy
         self.btn_detect_pref.setEnabled(not busy)
-        self.btn_create.setEnabled(not busy)
+        self._update_action_buttons()
         if busy:
             self.btn_detect_pref.setText('取得中...')
+            self.download_progress.setRange(0, 0)
+            self.download_progress.show()
         else:
             self.btn_detect_pref.setText('現在地から設定')
+            self.download_progress.hide()
 
     # ------------------------------------------------------------------
     # Data
     # ------------------------------------------------------------------
 
     def _load_data(self):
-        self._records = self.manager.load_csv()
+        """進捗 CSV をワーカースレッドで読み込む（完了後にチャート更新）."""
+        if self._load_thread and self._load_thread.isRunning():
+            return
+        self._records_loaded = False
+        self._update_action_buttons()
+        self._load_thread = _CsvLoadThread(self.manager)
+        self._load_thread.records_ready.connect(self._on_records_ready)
+        self._load_thread.start()
+
+    def _on_records_ready(self, records):
+        self._records = records
+        self._records_version += 1
+        self._filter_cache.clear()
+        self._records_loaded = True
+        self._update_action_buttons()
         self._update_chart()
+        if self._create_pending:
+            self._create_pending = False
+            self._create_layer()
+
+    def _update_action_buttons(self):
+        """レコード読込済みかつ処理中でない時だけ作成・出力を有効にする."""
+        ready = self._records_loaded and not self._busy
+        self.btn_create.setEnabled(ready)
+        self.btn_export.setEnabled(self._records_loaded)
 
     def _get_selected_statuses(self):
         statuses = []
@@ -333,14 +480,27 @@ class ProgressViewerPanel(QWidget):
         return statuses
 
     def _get_filtered_records(self):
-        return self.manager.filter_records(
-            self._records,
-            pref_code=self.combo_pref.currentData() or '',
-            statuses=self._get_selected_statuses(),
-        )
-
-    def _update_chart(self):
+        """現在のフィルタ条件で絞り込んだレコード（条件ごとにキャッシュ）."""
+        pref_code = self.combo_pref.currentData() or ''
+        statuses = self._get_selected_statuses()
+        key = (self._records_version, pref_code, frozenset(statuses))
+        filtered = self._filter_cache.get(key)
+        if filtered is None:
+            filtered = self.manager.filter_records(
+                self._records, pref_code=pref_code, statuses=statuses)
+            self._filter_cache[key] = filtered
+        return filtered
+
+    def _update_chart(self, *_args):
+        """チャート更新を予約（50ms 以内の変更はまとめて反映）."""
+        self._update_timer.start()
+
+    def _update_chart_now(self):
         filtered = self._get_filtered_records()
+        # 同じ条件ならキャッシュから同一リストが返るので、集計からやり直さない
+        if filtered is self._charted_records:
+            return
+        self._charted_records = filtered
         self.chart.update_data(filtered)
 
     # ------------------------------------------------------------------
@@ -348,15 +508,48 @@ class ProgressViewerPanel(QWidget):
     # ------------------------------------------------------------------
 
     def _refresh_layers(self):
-        self.combo_admin_layer.clear()
+        combo = self.combo_admin_layer
+        current_id = combo.currentData()
+        names, ids = [], []
         for layer_id, layer in QgsProject.instance().mapLayers().items():
-            if (isinstance(layer, QgsVectorLayer)
-                    and layer.geometryType() == QgsWkbTypes.PolygonGeometry
-                    and layer.fields().indexOf('N03_007') >= 0):
-                self.combo_admin_layer.addItem(layer.name(), layer_id)
+            if self._is_admin_layer(layer_id, layer):
+                names.append(layer.name())
+                ids.append(layer_id)
+
+        # 一括で入れ替え、途中の再描画・シグナルを抑止
+        combo.setUpdatesEnabled(False)
+        combo.blockSignals(True)
+        combo.clear()
+        combo.addItems(names)
+        for i, layer_id in enumerate(ids):
+            combo.setItemData(i, layer_id)
+        if current_id in ids:
+            combo.setCurrentIndex(ids.index(current_id))
+        combo.blockSignals(False)
+        combo.setUpdatesEnabled(True)
+
+    def _is_admin_layer(self, layer_id, layer):
+        """N03_007 を持つポリゴンレイヤか（レイヤID単位でキャッシュ）."""
+        if not isinstance(layer, QgsVectorLayer):
+            return False
+        is_admin = self._admin_layer_cache.get(layer_id)
+        if is_admin is None:
+            is_admin = (
+                layer.geometryType() == QgsWkbTypes.PolygonGeometry
+                and layer.fields().indexOf('N03_007') >= 0)
+            self._admin_layer_cache[layer_id] = is_admin
+        return is_admin
+
+    def _forget_admin_layers(self, layer_ids):
+        for layer_id in layer_ids:
+            self._admin_layer_cache.pop(layer_id, None)
 
     def _create_layer(self):
         """行政区域レイヤに直接フィルタとスタイルを適用."""
+        if not self._records_loaded:
+            # 行政区域ダウンロード完了時など、読込前の呼出しは完了後に実行
+            self._create_pending = True
+            return
         layer_id = self.combo_admin_layer.currentData()
         if not layer_id:
             QMessageBox.warning(self, 'エラー', '行政区域レイヤを選択してください。')
@@ -380,10 +573,11 @@ class ProgressViewerPanel(QWidget):
             )
             return
 
-        # 進捗データから一致する市区町村コードを収集
-        matching_codes = self.manager.find_matching_codes(
+        # 進捗データから一致する市区町村コード（とフィーチャID）を収集
+        matching = self.manager.find_matching_features(
             admin_layer, filtered, join_field
         )
+        matching_codes = set(matching)
 
         if not matching_codes:
             QMessageBox.warning(
@@ -393,8 +587,18 @@ class ProgressViewerPanel(QWidget):
             return
 
         # 行政区域レイヤにフィルタ適用
-        codes_str = ','.join(f"'{c}'" for c in sorted(matching_codes))
-        admin_layer.setSubsetString(f"{join_field} IN ({codes_str})")
+        # OGR は FID の整数比較で絞り込める（文字列 IN より軽い）。
+        # FID 列名の違い等で拒否された場合はコードの IN に切り替える
+        fids = sorted(fid for ids in matching.values() for fid in ids)
+        if not (admin_layer.providerType() == 'ogr'
+                and admin_layer.setSubsetString(
+                    f"FID IN ({','.join(map(str, fids))})")):
+            codes_str = ','.join(f"'{c}'" for c in sorted(matching_codes))
+            if not admin_layer.setSubsetString(
+                    f'"{join_field}" IN ({codes_str})'):
+                QMessageBox.warning(
+                    self, 'エラー', '行政区域レイヤに絞り込みを適用できませんでした。')
+                return
 
         # スタイル適用
         self.manager.apply_direct_style(
@@ -418,20 +622,73 @@ class ProgressViewerPanel(QWidget):
         )
 
     def _export_csv(self):
+        if not self._records_loaded:
+            return
         filtered = self._get_filtered_records()
         if not filtered:
             QMessageBox.warning(self, 'エラー', 'データがありません。')
             return
 
+        if self._export_thread and self._export_thread.isRunning():
+            return
+
         path, _ = QFileDialog.getSaveFileName(
             self, 'CSV出力先', '', 'CSV Files (*.csv)',
         )
-        if path:
-            self.manager.export_csv(filtered, path)
-            QMessageBox.information(self, '完了', f'{path} に出力しました。')
+        if not path:
+            return
+
+        # 書込みはワーカースレッドで行い、進捗ダイアログから中断できるようにする
+        dialog = QProgressDialog('CSV を出力中...', 'キャンセル',
+                                 0, len(filtered), self)
+        dialog.setWindowTitle('CSV出力')
+        dialog.setAutoClose(False)
+        dialog.setAutoReset(False)
+        dialog.setMinimumDuration(500)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+
+        thread = _CsvExportThread(self.manager, filtered, path)
+        thread.progress.connect(dialog.setValue)
+        thread.finished_ok.connect(self._on_export_done)
+        thread.error.connect(self._on_export_error)
+        thread.finished.connect(dialog.close)
+        dialog.canceled.connect(thread.requestInterruption)
+        self._export_thread = thread
+        thread.start()
+
+    def _on_export_done(self, path):
+        QMessageBox.information(self, '完了', f'{path} に出力しました。')
+
+    def _on_export_error(self, msg):
+        QMessageBox.critical(self, 'エラー', f'CSV 出力に失敗しました:\n{msg}')
 
     def cleanup(self):
+        self._update_timer.stop()
+        for signal, slot in (
+            (QgsProject.instance().layersRemoved, self._forget_admin_layers),
+            (QgsProject.instance().crsChanged, self._clear_xform_cache),
+            (self.iface.mapCanvas().destinationCrsChanged,
+             self._clear_xform_cache),
+        ):
+            try:
+                signal.disconnect(slot)
+            except TypeError:
+                pass
         self._clear_marker()
+        if self._load_thread and self._load_thread.isRunning():
+            self._load_thread.records_ready.disconnect(self._on_records_ready)
+            self._load_thread.wait()
+        if self._export_thread and self._export_thread.isRunning():
+            self._export_thread.finished_ok.disconnect(self._on_export_done)
+            self._export_thread.error.disconnect(self._on_export_error)
+            self._export_thread.requestInterruption()
+            self._export_thread.wait()
         if self._download_thread and self._download_thread.isRunning():
-            self._download_thread.terminate()
-            self._download_thread.wait()
+            # 受信ループが中断要求を見て抜ける。接続待ちなどで戻らない場合のみ強制終了
+            self._download_thread.requestInterruption()
+            if not self._download_thread.wait(2000):
+                QgsMessageLog.logMessage(
+                    '行政区域ダウンロードが停止しないため強制終了します',
+                    'JLSA-Loader', Qgis.Warning)
+                self._download_thread.terminate()
+                self._download_thread.wait()
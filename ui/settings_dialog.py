@@ -6,12 +6,37 @@ from qgis.PyQt.QtWidgets import (
     QLabel, QLineEdit, QPushButton, QCheckBox, QSpinBox,
     QMessageBox,
 )
-from qgis.PyQt.QtCore import Qt
+from qgis.PyQt.QtCore import (
+    Qt, QObject, QRunnable, QThreadPool, pyqtSignal,
+)
 
 from ..core.config import Config
 from ..services.cache_manager import CacheManager
 
 
+class _CacheSizeSignals(QObject):
+    """_CacheSizeTask の通知用."""
+
+    sizeReady = pyqtSignal(int, object)  # generation, size_bytes (int は 2GB 超に備え object)
+
+
+class _CacheSizeTask(QRunnable):
+    """キャッシュサイズ集計 (ファイル stat) を QThreadPool で実行."""
+
+    def __init__(self, cache, generation):
+        super().__init__()
+        self.cache = cache
+        self.generation = generation
+        self.signals = _CacheSizeSignals()
+
+    def run(self):
+        try:
+            size_bytes = self.cache.get_cache_size_bytes()
+        except OSError:
+            size_bytes = 0
+        self.signals.sizeReady.emit(self.generation, size_bytes)
+
+
 class SettingsPanel(QWidget):
     """Settings tab for plugin configuration."""
 
@@ -19,6 +44,7 @@ class SettingsPanel(QWidget):
         super().__init__(parent)
         self.config = Config()
         self.cache = CacheManager()
+        self._size_generation = 0  # 最新の集計要求のみ反映する
         self._setup_ui()
         self._load_settings()
 
@@ -114,7 +140,16 @@ class SettingsPanel(QWidget):
             QMessageBox.information(self, 'キャッシュ', 'キャッシュを削除しました。')
 
     def _update_cache_label(self):
-        size_bytes = self.cache.get_cache_size_bytes()
+        """キャッシュサイズをバックグラウンドで集計してラベルに反映."""
+        self._size_generation += 1
+        self.lbl_cache_size.setText('キャッシュサイズ: 計算中...')
+        task = _CacheSizeTask(self.cache, self._size_generation)
+        task.signals.sizeReady.connect(self._on_cache_size_ready)
+        QThreadPool.globalInstance().start(task)
+
+    def _on_cache_size_ready(self, generation, size_bytes):
+        if generation != self._size_generation:
+            return  # 古い集計結果（クリア前など）は捨てる
         if size_bytes < 1024:
             size_str = f'{size_bytes} B'
         elif size_bytes < 1024 * 1024:
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 """地番情報カードウィジェット."""
 
-from typing import Dict
+from typing import Callable, Dict, List, Tuple
 
 from qgis.PyQt.QtWidgets import (
     QGroupBox, QFormLayout, QLabel,
@@ -26,6 +26,8 @@ class ParcelInfoCard(QGroupBox):
     def __init__(self, parent=None):
         super().__init__('検索結果', parent)
         self._labels: Dict[str, QLabel] = {}
+        # (key, setText) — show_info はこれを回すだけ
+        self._plan: List[Tuple[str, Callable[[str], None]]] = []
         self._setup_ui()
 
     def _setup_ui(self):
@@ -35,13 +37,13 @@ class ParcelInfoCard(QGroupBox):
             val_label.setWordWrap(True)
             form.addRow(f'{label_text}:', val_label)
             self._labels[key] = val_label
+            self._plan.append((key, val_label.setText))
 
     def show_info(self, info: Dict):
-        for label_text, key in _DISPLAY_FIELDS:
-            val = info.get(key, '-')
-            if val is None:
-                val = '-'
-            self._labels[key].setText(str(val))
+        get = info.get
+        for key, set_text in self._plan:
+            val = get(key)
+            set_text('-' if val is None else str(val))
 
     def clear_info(self):
         for lbl in self._labels.values():
@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
 """進捗チャートウィジェット — simple bar chart drawn with QPainter."""
 
-from typing import List, Dict
+from collections import Counter
+from typing import List, Dict, Tuple
 
 from qgis.PyQt.QtWidgets import QWidget
 from qgis.PyQt.QtCore import Qt, QRectF
@@ -15,6 +16,21 @@ STATUS_COLORS = {
     '未着手': QColor('#999999'),
 }
 
+# 描画順の (ステータス, 色) と枠線ペン — paintEvent 毎に作らない
+_STATUS_ORDER = tuple(
+    (s, STATUS_COLORS[s]) for s in ('完了', '実施中', '休止中', '未着手'))
+_OUTLINE_PEN = QPen(QColor('#333333'), 1)
+_TEXT_COLOR = QColor('#000000')
+
+
+# 棒・凡例の配置 (px)
+_BAR_X = 10
+_BAR_Y = 10
+_BAR_H = 30
+_LEGEND_Y = _BAR_Y + _BAR_H + 10
+_LEGEND_STEP = 100
+_SWATCH = 12
+
 
 class ProgressChartWidget(QWidget):
     """Draws a horizontal stacked bar showing status distribution."""
@@ -23,17 +39,41 @@ class ProgressChartWidget(QWidget):
         super().__init__(parent)
         self._counts: Dict[str, int] = {}
         self._total: int = 0
+        # 色ごとの矩形 (棒のセグメント + 凡例の見本) — データ更新・リサイズ時のみ
+        # 再計算し、paintEvent では色毎に drawRects を1回呼ぶだけにする
+        self._rects_by_color: List[Tuple[QColor, List[QRectF]]] = []
         self.setMinimumHeight(80)
 
     def update_data(self, records: List[Dict]):
-        counts = {}
-        for r in records:
-            s = r.get('status', '未着手')
-            counts[s] = counts.get(s, 0) + 1
+        counts = Counter(r.get('status', '未着手') for r in records)
+        if counts == self._counts and len(records) == self._total:
+            return  # 表示内容が同じなら再描画しない
         self._counts = counts
-        self._total = sum(counts.values())
+        self._total = len(records)
+        self._layout_segments()
         self.update()
 
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._layout_segments()
+
+    def _layout_segments(self):
+        """棒グラフの各セグメントと凡例見本の矩形を色ごとに計算."""
+        groups = []
+        if self._total:
+            w = self.width() - 2 * _BAR_X
+            x = _BAR_X
+            for i, (status, color) in enumerate(_STATUS_ORDER):
+                rects = [QRectF(_BAR_X + i * _LEGEND_STEP, _LEGEND_Y,
+                                _SWATCH, _SWATCH)]
+                count = self._counts.get(status, 0)
+                if count:
+                    seg_w = max(1, int(w * count / self._total))
+                    rects.append(QRectF(x, _BAR_Y, seg_w, _BAR_H))
+                    x += seg_w
+                groups.append((color, rects))
+        self._rects_by_color = groups
+
     def paintEvent(self, event):
         if self._total == 0:
             return
@@ -41,45 +81,26 @@ class ProgressChartWidget(QWidget):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
 
-        w = self.width() - 20
-        h = self.height()
-        bar_h = 30
-        bar_y = 10
-        x = 10
-
-        # Draw stacked bar
-        for status in ['完了', '実施中', '休止中', '未着手']:
-            count = self._counts.get(status, 0)
-            if count == 0:
-                continue
-            seg_w = max(1, int(w * count / self._total))
-            color = STATUS_COLORS.get(status, QColor('#cccccc'))
+        # Stacked bar and legend swatches: one drawRects per colour
+        painter.setPen(_OUTLINE_PEN)
+        for color, rects in self._rects_by_color:
             painter.setBrush(color)
-            painter.setPen(QPen(QColor('#333333'), 1))
-            painter.drawRect(QRectF(x, bar_y, seg_w, bar_h))
-            x += seg_w
+            painter.drawRects(rects)
 
-        # Draw legend
-        legend_y = bar_y + bar_h + 10
-        lx = 10
+        # Legend text
         font = QFont()
         font.setPointSize(8)
         painter.setFont(font)
+        painter.setPen(_TEXT_COLOR)
 
-        for status in ['完了', '実施中', '休止中', '未着手']:
+        text_y = _LEGEND_Y + 11
+        lx = _BAR_X
+        for status, _color in _STATUS_ORDER:
             count = self._counts.get(status, 0)
-            color = STATUS_COLORS.get(status, QColor('#cccccc'))
-            painter.setBrush(color)
-            painter.setPen(QPen(QColor('#333333'), 1))
-            painter.drawRect(QRectF(lx, legend_y, 12, 12))
-            painter.setPen(QColor('#000000'))
-            painter.drawText(
-                int(lx + 16), int(legend_y + 11),
-                f'{status}: {count}'
-            )
-            lx += 100
+            painter.drawText(lx + _SWATCH + 4, text_y, f'{status}: {count}')
+            lx += _LEGEND_STEP
 
         # Total label
-        painter.drawText(int(lx + 10), int(legend_y + 11), f'計: {self._total}')
+        painter.drawText(lx + 10, text_y, f'計: {self._total}')
 
         painter.end()